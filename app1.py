@@ -8,14 +8,27 @@ st.set_page_config(
         initial_sidebar_state="expanded"
     )
 
+import importlib
+
 from streamlit.components.v1 import html
 import streamlit.components.v1 as components
 
-from app_user_info import run_user_info
-# from app_pref import run_pref
-from app_eda import run_eda
-from app_ml import run_ml
-from app_img import run_img
+# 메뉴 → (페이지 모듈, 실행 함수)
+# 페이지 모듈은 처음 선택될 때 import합니다. 홈 화면은 Streamlit만으로 뜨고,
+# google.generativeai, scikit-learn, PIL, plotly 등은 해당 페이지를 열 때 불러옵니다.
+# (한 번 불러온 모듈은 sys.modules에 남아 이후 재실행에서는 비용이 없음)
+PAGES = {
+    "사용자 정보 입력": ("app_user_info", "run_user_info"),
+    "AI 맞춤 식단 설정": ("app_ml", "run_ml"),
+    "음식 영양 정보 보기": ("app_eda", "run_eda"),
+    "AI 음식 영양 분석기": ("app_img", "run_img"),
+    "내 맛 선호도 입력": ("app_pref", "run_pref"),
+}
+
+def load_page(item):
+    """메뉴 항목의 페이지 실행 함수를 (필요하면 모듈을 import해) 반환합니다."""
+    module_name, func_name = PAGES[item]
+    return getattr(importlib.import_module(module_name), func_name)
 
 # Theme detection script
 def detect_system_theme():
@@ -214,8 +227,7 @@ def main():
             "AI 맞춤 식단 설정": "🍱",
             "음식 영양 정보 보기": "📊",
             "AI 음식 영양 분석기": "🤖",
-            # "내 맛 선호도 입력": "🌶️"
-            
+            "내 맛 선호도 입력": "🌶️",
         }
         
         menu = list(menu_icons.keys())
@@ -352,16 +364,8 @@ def main():
         </div>
         """, unsafe_allow_html=True)
             
-    elif "사용자 정보" in choice:
-        run_user_info()
-    elif "식단 설정" in choice:
-        run_ml()
-    elif "영양 정보" in choice:
-        run_eda()
-    elif "분석기" in choice:
-        run_img()
-    # elif "맛 선호도" in choice:
-        # run_pref()
+    elif choice in PAGES:
+        load_page(choice)()
 
 
 if __name__ == "__main__":
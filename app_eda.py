@@ -1,12 +1,13 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
 
+from food_ai.core import food_feedback, intake_levels
+from food_charts import macro_donut
+from food_metrics import get_food_metrics
+from food_search import search_foods
+from food_substitutes import TARGETS, flagged_nutrients, get_substitute_index
 
 
 def run_eda():
-    df = pd.read_csv('./food1.csv')
-
     st.markdown("""
         <div style="text-align: center; padding: 2rem 0;">
             <h1 style="color: var(--primary-color);">음식 영양 정보</h1>
@@ -20,20 +21,27 @@ def run_eda():
     # 음식 선택 + 섭취량 입력
     col1, col2 = st.columns([3, 1])
     with col1:
-        choice = st.selectbox("음식을 선택하세요", df["식품명"].unique())
+        # 전체 목록 대신 서버에서 검색한 상위 결과만 선택지로 전달
+        query = st.text_input("음식 검색", placeholder="예: 김치찌개, 국ㅂ, ㄱㅂ (초성 검색 가능)")
+        choice = st.selectbox("음식을 선택하세요", search_foods(query))
     with col2:
         user_amount = st.number_input("섭취량 (g/ml)", min_value=1, max_value=1000, value=100, step=10)
 
-    info = df[df["식품명"] == choice].iloc[0]
-    ratio = user_amount / 100
+    if choice is None:
+        st.warning("검색 결과가 없습니다. 다른 이름으로 검색해보세요.")
+        return
+
+    # 🔹 미리 계산된 100g 기준 지표 조회 → 섭취량 비율만 곱함
+    metrics = get_food_metrics().get(choice, user_amount)
+    adj_energy = metrics['에너지(kcal)']
+    adj_carb = metrics['탄수화물(g)']
+    adj_protein = metrics['단백질(g)']
+    adj_fat = metrics['지방(g)']
+    adj_sodium = metrics['나트륨(mg)']
+    adj_sugar = metrics['당류(g)']
 
-    # 🔹 섭취량에 따른 영양값 계산
-    adj_energy = info['에너지(kcal)'] * ratio
-    adj_carb = info['탄수화물(g)'] * ratio
-    adj_protein = info['단백질(g)'] * ratio
-    adj_fat = info['지방(g)'] * ratio
-    adj_sodium = info['나트륨(mg)'] * ratio if '나트륨(mg)' in info else None
-    adj_sugar = info['당류(g)'] * ratio if '당류(g)' in info else None
+    # 섭취량에 따라 달라지는 나트륨·당류 규칙 (nutrition_rules)
+    intake = intake_levels(metrics)
 
     # 음식명 + 섭취량 표시
     st.markdown(f"## 🍽️ {choice} ({user_amount:.0f}g 기준)")
@@ -49,76 +57,40 @@ def run_eda():
     if adj_sodium is not None or adj_sugar is not None:
         st.markdown("### 🧂 나트륨 · 당류 섭취량")
 
-        rec_sodium = 2000  # 하루 권장 나트륨 (mg)
-        rec_sugar = 50     # 하루 권장 당류 (g)
-
-        sodium_ratio = (adj_sodium / rec_sodium * 100) if adj_sodium else 0
-        sugar_ratio = (adj_sugar / rec_sugar * 100) if adj_sugar else 0
+        # 하루 권장량 대비 비율 (food_metrics에서 미리 계산) + 신호등 규칙
+        sodium_ratio = metrics['sodium_pct']
+        sugar_ratio = metrics['sugar_pct']
 
         col1, col2 = st.columns(2)
         if adj_sodium is not None:
-            color = "🟢" if sodium_ratio < 30 else "🟠" if sodium_ratio < 70 else "🔴"
-            col1.write(f"**나트륨:** {adj_sodium:.0f} mg ({sodium_ratio:.1f}% {color})")
+            col1.write(f"**나트륨:** {adj_sodium:.0f} mg ({sodium_ratio:.1f}% {intake['sodium_level']})")
         if adj_sugar is not None:
-            color = "🟢" if sugar_ratio < 30 else "🟠" if sugar_ratio < 70 else "🔴"
-            col2.write(f"**당류:** {adj_sugar:.1f} g ({sugar_ratio:.1f}% {color})")
+            col2.write(f"**당류:** {adj_sugar:.1f} g ({sugar_ratio:.1f}% {intake['sugar_level']})")
 
-    # 🔹 도넛 그래프 (기존 그대로 유지)
+    # 🔹 도넛 그래프 (비율은 섭취량과 무관 → 음식별로 캐시된 Figure 재사용)
     st.markdown("### 🥗 영양소 비율")
-    nutrients = ['탄수화물', '단백질', '지방']
-    values = [adj_carb, adj_protein, adj_fat]
-    colors = ['#2ECC71', '#3498DB', '#E74C3C']
-
-    fig = px.pie(
-        names=nutrients,
-        values=values,
-        color=nutrients,
-        color_discrete_sequence=colors,
-        hole=0.4,
-        title=f"{choice}의 영양 비율 ({user_amount:.0f}g 기준)"
-    )
-    fig.update_traces(textinfo='percent+label', pull=[0.05, 0.05, 0.05])
-    fig.update_layout(legend_title="영양소", margin=dict(t=50, b=20, l=0, r=0))
+    base = get_food_metrics().get(choice)
+    fig = macro_donut(choice, base['탄수화물(g)'], base['단백질(g)'], base['지방(g)'])
     st.plotly_chart(fig, use_container_width=True)
 
     # 🔹 자동 피드백
     st.markdown("### 💬 식단 피드백")
 
-    carb_ratio = adj_carb * 4 / adj_energy * 100 if adj_energy > 0 else 0
-    protein_ratio = adj_protein * 4 / adj_energy * 100 if adj_energy > 0 else 0
-    fat_ratio = adj_fat * 9 / adj_energy * 100 if adj_energy > 0 else 0
-
-    feedback = []
-
-    # 탄수화물 비율 피드백
-    if carb_ratio > 60:
-        feedback.append("🍚 탄수화물 비중이 높아요. 밥이나 빵류 섭취를 줄여보세요.")
-    elif carb_ratio < 40:
-        feedback.append("🍞 탄수화물 비중이 낮아요. 에너지를 충분히 섭취하세요.")
-    else:
-        feedback.append("✅ 탄수화물 비율이 적정합니다.")
-
-    # 단백질 피드백
-    if protein_ratio < 15:
-        feedback.append("💪 단백질 섭취가 적습니다. 달걀, 닭가슴살, 두부를 추가해보세요.")
-    elif protein_ratio > 25:
-        feedback.append("🥩 단백질이 많아요. 탄수화물과의 균형을 확인해보세요.")
-    else:
-        feedback.append("✅ 단백질 섭취가 적당합니다.")
-
-    # 지방 피드백
-    if fat_ratio > 30:
-        feedback.append("🍟 지방 섭취가 높아요. 튀김이나 가공식품을 줄이세요.")
-    elif fat_ratio < 10:
-        feedback.append("🥑 지방이 적어요. 견과류나 올리브유로 보충해보세요.")
-    else:
-        feedback.append("✅ 지방 섭취도 적정합니다.")
-
-    # 나트륨, 당류 피드백
-    if adj_sodium and adj_sodium > 1500:
-        feedback.append("⚠️ 나트륨이 높아요. 짠 음식 섭취를 줄이세요.")
-    if adj_sugar and adj_sugar > 30:
-        feedback.append("⚠️ 당류가 많아요. 단 음료나 디저트는 자제하세요.")
-
-    for fb in feedback:
+    # 탄수화물 / 단백질 / 지방 에너지 비율 + 나트륨, 당류 피드백 (food_ai.core)
+    for fb in food_feedback(metrics):
         st.write(fb)
+
+    # 🔹 문제가 된 영양소가 있으면 영양 구성이 비슷하면서 그 영양소가 낮은 음식 추천
+    flagged = flagged_nutrients(metrics)
+    if flagged:
+        st.markdown("### 🔄 더 건강한 대안")
+        same_category = st.checkbox("같은 분류(식품코드)의 음식에서만 찾기", value=True)
+        substitutes = get_substitute_index()
+        for target in flagged:
+            label = TARGETS[target][1]
+            table = substitutes.substitutes(choice, target, k=5, same_category=same_category)
+            if table.empty:
+                st.caption(f"{label}을 찾지 못했습니다.")
+            else:
+                st.markdown(f"**{label}** (100g 기준, 거리가 작을수록 비슷함)")
+                st.dataframe(table, use_container_width=True, hide_index=True)
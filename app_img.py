@@ -1,82 +1,85 @@
 import streamlit as st
 import pandas as pd
-import os
-import google.generativeai as genai
-from PIL import Image
-from sklearn.ensemble import GradientBoostingRegressor
-import re
-import joblib
+import concurrent.futures
+
+from calorie_estimator import get_linear_estimator
+from food_ai.core import ANALYSIS_CONFIG, build_prompt, correct_kcal, nutrient_row, parse_analysis, totals_table
+from food_index import get_food_index
+from food_match import HIGH_CONFIDENCE, match_food
+from image_hash import dhash, get_hash_index, hash_hex, phash
+from image_prep import prepare_image
+from llm_client import get_llm_client
+from model_registry import get_regressor, warm_up
+from response_cache import get_cache, make_key
+
+DB_COLUMNS = ["에너지(kcal)", "탄수화물(g)", "단백질(g)", "지방(g)", "당류(g)", "나트륨(mg)"]
 
 # ============================================================
 # 1. 환경 설정 및 헬퍼 함수
 # ============================================================
 
-def load_model():
-    """Gemini AI 모델을 로드합니다."""
-    try:
-        api_key = st.secrets["GEMINI_API_KEY"]
-        genai.configure(api_key=api_key)
-        return genai.GenerativeModel("gemini-2.5-flash")
-    except Exception:
-        st.error("❌ Gemini API 키가 누락되었습니다. secrets.toml에 GEMINI_API_KEY를 추가하세요.")
-        return None
-
-def extract_number(text, keyword):
-    """AI 응답 텍스트에서 특정 키워드의 숫자 값을 추출합니다."""
-    pattern = rf"{keyword}.*?(\d+)"
-    match = re.search(pattern, text)
-    return int(match.group(1)) if match else None
-
-def extract_section(text, start, end_marker=None):
-    """AI 응답 텍스트에서 특정 섹션의 내용을 추출합니다."""
-    start_idx = text.find(start)
-    if start_idx == -1:
-        return ""
-    start_idx += len(start)
-    if end_marker:
-        end_idx = text.find(end_marker, start_idx)
-        if end_idx == -1:
-            end_idx = len(text)
-    else:
-        end_idx = len(text)
-    return text[start_idx:end_idx].strip()
-
-def load_regression_model():
-    """회귀 모델 로드 또는 자동 생성"""
-    base_dir = os.path.dirname(__file__)
-    model_path = os.path.join(base_dir, "food_calorie_model.pkl")
-
-    # 모델이 없으면 자동 생성
-    if not os.path.exists(model_path):
-        st.warning("⚠️ 사전 학습된 모델이 없습니다. 새 모델을 학습 중입니다...")
-
-        # 기본 학습 데이터 (샘플 구조)
-        df = pd.DataFrame({
-            "탄수화물(g)": [50, 100, 150, 200, 250],
-            "단백질(g)": [10, 20, 30, 40, 50],
-            "지방(g)": [5, 10, 15, 20, 25],
-            "당류(g)": [5, 10, 20, 30, 40],
-            "나트륨(mg)": [300, 500, 800, 1000, 1200],
-            "열량(kcal)": [300, 500, 700, 900, 1100]
-        })
-
-        X = df[["탄수화물(g)", "단백질(g)", "지방(g)", "당류(g)", "나트륨(mg)"]]
-        y = df["열량(kcal)"]
-
-        model = GradientBoostingRegressor(random_state=42)
-        model.fit(X, y)
-        joblib.dump(model, model_path)
-        st.success("✅ 새 모델 학습 및 저장 완료!")
-        return model
-
-    # 기존 모델 로드 (호환성 예외처리)
-    try:
-        model = joblib.load(model_path)
-    except (ValueError, ModuleNotFoundError) as e:
-        st.warning("⚠️ 모델 파일이 호환되지 않아 새로 학습합니다.")
-        os.remove(model_path)
-        return load_regression_model()
-    return model
+def db_nutrient_table(matches):
+    """매칭된 식품명의 데이터베이스 영양 정보 표를 만듭니다. (100g 기준)"""
+    index = get_food_index()
+    rows = []
+    for name, score in matches:
+        info = index.first(name)
+        rows.append({"식품명": name, "유사도": round(score, 2), **{c: info[c] for c in DB_COLUMNS}})
+    return pd.DataFrame(rows)
+
+def analysis_scope(user_food_name=""):
+    """거의 같은 사진 검색 범위: 음식 이름과 프롬프트가 같은 분석끼리만 재사용."""
+    return int(make_key(user_food_name.strip(), build_prompt(user_food_name))[:16], 16)
+
+def hash_index(cache):
+    """거의 같은 사진 검색 인덱스. 프로세스에서 처음 쓸 때 캐시에 저장된 pHash로 채웁니다."""
+    return get_hash_index(cache.near_hashes)
+
+def analyze_image(prepared, user_food_name, cache, get_llm=get_llm_client):
+    """
+    사진 한 장의 분석을 시작합니다.
+    같은 사진(dHash 키) 또는 거의 같은 사진(pHash 해밍 거리)의 결과가 캐시에 있으면
+    (키, 응답 텍스트)를, 없으면 (키, concurrent.futures.Future)를 반환합니다.
+    get_llm()은 캐시에 없을 때만 호출됩니다. (기본: llm_client.get_llm_client)
+    """
+    prompt = build_prompt(user_food_name)
+    cache_key = make_key(hash_hex(dhash(prepared.image)), user_food_name.strip(), prompt)
+    cached = cache.get(cache_key)
+    if cached is None:
+        # 잘림, 재압축, 스크린샷 등으로 조금 달라진 사진
+        near = hash_index(cache).lookup(phash(prepared.image), analysis_scope(user_food_name))
+        if near is not None:
+            cached = cache.get(near[0])
+    if cached is not None:
+        return cache_key, cached
+    future = get_llm().submit([prompt, prepared.blob()], key=cache_key, generation_config=ANALYSIS_CONFIG)
+    return cache_key, future
+
+def remember_analysis(prepared, user_food_name, cache, cache_key, text):
+    """
+    분석 결과를 캐시에 저장하고, 거의 같은 사진을 찾을 수 있도록 해시 인덱스에 등록합니다.
+    pHash와 검색 범위도 캐시에 함께 저장해 재시작 후 인덱스를 복원합니다.
+    """
+    image_hash, scope = phash(prepared.image), analysis_scope(user_food_name)
+    cache.put(cache_key, text, image_hash, scope)
+    hash_index(cache).add(image_hash, cache_key, scope)
+
+def show_result(result, corrected, user_food_name=""):
+    """사진 한 장의 분석 결과와 데이터베이스 비교를 표시합니다."""
+    title = result["food_name"] or user_food_name or "사진 속 음식"
+    st.markdown(f"**{title}** {result['serving']}")
+    st.dataframe(pd.DataFrame([nutrient_row(result)]), use_container_width=True, hide_index=True)
+    if result["comment"]:
+        st.write(result["comment"])
+
+    if corrected:
+        st.success(f"✨ 보정된 칼로리 예측: **{corrected:.2f} kcal**")
+
+    # AI가 추정한 음식 이름을 데이터베이스와 연결
+    ai_matches = match_food(result["food_name"] or user_food_name)
+    if ai_matches:
+        st.markdown("#### 📚 데이터베이스 비교 (100g 기준)")
+        st.dataframe(db_nutrient_table(ai_matches), use_container_width=True, hide_index=True)
 
 # ============================================================
 # 2. 메인 실행 함수
@@ -92,64 +95,108 @@ def run_img():
         </div>
     """, unsafe_allow_html=True)
 
-    regressor = load_regression_model()
+    # 기본은 선형 추정기, 선택 시 GradientBoosting 모델 (프로세스 공용, 준비 중이면 None)
+    # 페이지를 처음 열 때 백그라운드에서 모델 로드 시작 (프로세스당 1회)
+    warm_up()
+    use_tree = st.checkbox("정밀 보정 모델 사용 (GradientBoosting, 느림)")
+    regressor = get_regressor() if use_tree else get_linear_estimator()
     if regressor is None:
-        st.stop()
+        st.info("⏳ 칼로리 보정 모델을 준비 중입니다. 잠시 후 보정된 칼로리를 확인할 수 있어요.")
 
     # 이미지 업로드 UI
     st.markdown("""
         <div class="custom-card">
             <h2>📸 음식 사진 업로드</h2>
-            <p>분석할 음식의 사진을 업로드하세요.</p>
+            <p>분석할 음식의 사진을 업로드하세요. 하루 식사를 여러 장 한 번에 올려도 됩니다.</p>
         </div>
     """, unsafe_allow_html=True)
 
-    file = st.file_uploader("", type=['jpg', 'jpeg', 'png', 'webp'])
-    user_food_name = st.text_input("음식 이름 (선택 사항)", placeholder="예: 닭가슴살 샐러드")
+    files = st.file_uploader("", type=['jpg', 'jpeg', 'png', 'webp'], accept_multiple_files=True)
+    user_food_name = st.text_input("음식 이름 (선택 사항, 사진 1장일 때)", placeholder="예: 닭가슴살 샐러드")
 
-    if not file:
+    if not files:
         st.info("👆 사진을 업로드해주세요.")
         return
+    if len(files) > 1:
+        user_food_name = ""  # 여러 장이면 사진마다 AI가 이름을 추정
+
+    # 모델에 보내기 전에 축소 + 재인코딩 (EXIF 회전 반영, 메타데이터 제거)
+    images = [prepare_image(file) for file in files]
+    titles = [file.name for file in files]
+    if len(images) == 1:
+        st.image(images[0].image, width=800)
+    else:
+        st.image([p.image for p in images], caption=titles, width=240)
+    st.caption("🗜️ 이미지 전처리: " + " / ".join(p.summary() for p in images))
+
+    # 입력한 이름이 데이터베이스와 확실히 일치하면 AI 호출 없이 DB 값을 바로 보여줌
+    db_matches = match_food(user_food_name) if user_food_name else []
+    if db_matches and db_matches[0][1] >= HIGH_CONFIDENCE:
+        st.markdown("### 📚 데이터베이스 영양 정보 (100g 기준)")
+        st.success(f"✅ '{db_matches[0][0]}'과(와) 일치하는 음식을 찾았습니다. AI 분석 없이 확인할 수 있어요.")
+        st.dataframe(db_nutrient_table(db_matches[:1]), use_container_width=True, hide_index=True)
+        if not st.checkbox("사진으로 AI 분석도 실행하기"):
+            return
 
-    image = Image.open(file)
-    st.image(image, width=800)
+    if not st.button("🚀 AI 영양 분석 시작", type="primary"):
+        return
 
-    if st.button("🚀 AI 영양 분석 시작", type="primary"):
-        model = load_model()
-        if model is None:
-            return
+    cache = get_cache("image")
 
-        with st.spinner("🤖 AI가 이미지를 분석 중입니다..."):
-            prompt = f"""
-            당신은 한국 음식 영양분석에 전문적인 영양 코치입니다.
-            음식 사진을 보고 영양 성분을 1인분 기준으로 추정하세요.
-            음식 이름: {user_food_name if user_food_name else "사진 속 음식"}
-            """
-            ex = model.generate_content([prompt, image])
-            finish = ex.text.strip()
-
-        # 결과 파싱
-        kcal = extract_number(finish, "열량")
-        carbo = extract_number(finish, "탄수화물")
-        protein = extract_number(finish, "단백질")
-        fat = extract_number(finish, "지방")
-        sugar = extract_number(finish, "당류")
-        sodium = extract_number(finish, "나트륨")
-
-        # 보정 모델 사용
-        if all(v is not None for v in [carbo, protein, fat, sugar, sodium]):
-            new_data = pd.DataFrame([[carbo, protein, fat, sugar, sodium]],
-                                    columns=["탄수화물(g)", "단백질(g)", "지방(g)", "당류(g)", "나트륨(mg)"])
-            corrected_kcal = regressor.predict(new_data)[0]
+    # 캐시에 없는 사진만 공용 클라이언트에 한꺼번에 제출 (동시 요청 수는 클라이언트가 제한)
+    texts = [None] * len(images)
+    pending = {}
+    for i, prepared in enumerate(images):
+        try:
+            cache_key, answer = analyze_image(prepared, user_food_name, cache)
+        except RuntimeError as e:  # API 키 없음
+            st.error(f"❌ {e}")
+            return
+        if isinstance(answer, str):
+            texts[i] = answer
         else:
-            corrected_kcal = None
-
-        # 결과 표시
-        st.markdown("### 📊 AI 분석 결과")
-        st.write(finish)
+            pending[answer] = (i, cache_key)
+
+    done = len(images) - len(pending)
+    if done:
+        st.caption(f"⚡ {done}장은 이전에 분석한 결과를 불러왔습니다.")
+
+    errors = {}
+    if pending:
+        label = "🤖 AI가 이미지를 분석 중입니다..."
+        progress = st.progress(done / len(images), text=f"{label} ({done}/{len(images)})")
+        for future in concurrent.futures.as_completed(pending):
+            i, cache_key = pending[future]
+            try:
+                texts[i] = future.result().strip()
+                remember_analysis(images[i], user_food_name, cache, cache_key, texts[i])
+            except Exception as e:
+                errors[i] = str(e)
+            done += 1
+            progress.progress(done / len(images), text=f"{label} ({done}/{len(images)})")
+        progress.empty()
+
+    # 결과 파싱 (JSON 한 번, 실패 시 정규식) + 보정 칼로리 일괄 계산
+    results = [parse_analysis(text) if text is not None else None for text in texts]
+    corrected = correct_kcal(regressor, results)
+
+    # 결과 표시
+    st.markdown("### 📊 AI 분석 결과")
+    if len(images) == 1:
+        if results[0] is None:
+            st.error(f"❌ 분석에 실패했습니다: {errors[0]}")
+        else:
+            show_result(results[0], corrected[0], user_food_name)
+        return
 
-        if corrected_kcal:
-            st.success(f"✨ 보정된 칼로리 예측: **{corrected_kcal:.2f} kcal**")
+    st.dataframe(totals_table(titles, results, corrected), use_container_width=True, hide_index=True)
+    for i, title in enumerate(titles):
+        with st.expander(f"📷 {title}"):
+            st.image(images[i].image, width=400)
+            if results[i] is None:
+                st.error(f"❌ 분석에 실패했습니다: {errors[i]}")
+            else:
+                show_result(results[i], corrected[i])
 
 # ============================================================
 # 3. 앱 실행
@@ -1,38 +1,38 @@
 import streamlit as st
 import os
-import google.generativeai as genai
 
 # app_user_info 모듈에서 필요한 함수를 임포트합니다.
 # get_bmi_criteria를 추가하여 나이별 기준을 사용할 수 있게 합니다.
 from app_user_info import get_user_data, get_bmi_criteria 
-
-
-# 제미나이 API 키 불러오기
-api_key=st.secrets["GEMINI_API_KEY"]
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel('gemini-2.5-flash')
+from food_ai.core import STATUS_LABELS, bmi_category
+from llm_client import get_llm_client
+from meal_planner import ITEMS_PER_MEAL, MEALS, TARGET_COLUMNS, daily_targets, get_meal_planner, plan_totals
+from response_cache import get_cache, make_key
 
 
 
 def determine_bmi_status(bmi, age):
-    """app_user_info.py의 나이별 기준에 따라 BMI 상태를 결정합니다."""
+    """나이별 기준에 따라 BMI 상태(저체중/정상/과체중/비만)를 결정합니다. (food_ai.core)"""
     if bmi is None or age is None:
         return "정보 없음"
-    
-    criteria = get_bmi_criteria(age)
-    
-    if bmi < criteria['underweight']:
-        return "저체중"
-    elif bmi < criteria['normal_max']:
-        return "정상"
-    elif bmi <= criteria['overweight_max']:
-        return "과체중"
-    else:
-        return "비만"
+    return STATUS_LABELS[bmi_category(bmi, age)]
 
-# get_ai_diet_recommendation 함수에 age 매개변수 추가
-def get_ai_diet_recommendation(bmi: float, age: int, preferences: list, avoid_foods: list) -> str:
-    """AI를 통한 맞춤형 식단 추천"""
+def diet_cache_key(bmi: float, age: int, preferences: list, avoid_foods: list) -> str:
+    """식단 추천 캐시 키: BMI 구간(1 단위), 연령대, 정렬된 선호/기피 음식 목록"""
+    def normalize(foods):
+        return sorted({food.strip().lower() for food in foods if food.strip()})
+
+    return make_key(
+        "diet",
+        int(bmi),
+        get_bmi_criteria(age)['age_group'],
+        determine_bmi_status(bmi, age),
+        normalize(preferences),
+        normalize(avoid_foods),
+    )
+
+def build_diet_prompt(bmi: float, age: int, preferences: list, avoid_foods: list) -> str:
+    """식단 추천 프롬프트 생성"""
     
     # BMI 카테고리 결정: app_user_info의 age-specific 기준 사용
     bmi_category = determine_bmi_status(bmi, age)
@@ -65,13 +65,88 @@ def get_ai_diet_recommendation(bmi: float, age: int, preferences: list, avoid_fo
     
     ### ⚠️ 주의사항:
     """
+    return prompt
+
+# get_ai_diet_recommendation 함수에 age 매개변수 추가
+def get_ai_diet_recommendation(bmi: float, age: int, preferences: list, avoid_foods: list) -> str:
+    """AI를 통한 맞춤형 식단 추천 (같은 조건의 응답은 캐시에서 재사용)"""
+    
+    cache = get_cache("diet")
+    cache_key = diet_cache_key(bmi, age, preferences, avoid_foods)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    prompt = build_diet_prompt(bmi, age, preferences, avoid_foods)
     
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        # 공용 비동기 클라이언트 (처음 호출 시 생성): 동시 요청 수 제한, 타임아웃, 재시도, 같은 요청 합치기
+        text = get_llm_client().generate(prompt, key=cache_key)
+        cache.put(cache_key, text)
+        return text
     except Exception as e:
         return f"식단 생성 중 오류가 발생했습니다: {str(e)}"
 
+def stream_ai_diet_recommendation(bmi: float, age: int, preferences: list, avoid_foods: list):
+    """
+    AI 식단 추천을 생성되는 대로 조각(str) 단위로 내보냅니다.
+    st.write_stream에 넘기면 아침/점심/저녁 섹션이 도착하는 즉시 화면에 표시되고,
+    전체 응답은 스트림이 끝난 뒤 캐시에 저장됩니다.
+    """
+    cache = get_cache("diet")
+    cache_key = diet_cache_key(bmi, age, preferences, avoid_foods)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+    
+    prompt = build_diet_prompt(bmi, age, preferences, avoid_foods)
+    
+    chunks = []
+    try:
+        for chunk in get_llm_client().stream(prompt):
+            chunks.append(chunk)
+            yield chunk
+    except Exception as e:
+        yield f"\n\n식단 생성 중 오류가 발생했습니다: {str(e)}"
+        return
+    cache.put(cache_key, "".join(chunks))
+
+def show_notes():
+    """식단 아래에 표시하는 주의사항"""
+    st.info("""
+    💡 **참고사항**
+    - 이 식단은 참고용이며, 실제 섭취 시에는 개인의 건강 상태를 고려해주세요.
+    - 특별한 건강 상태나 질환이 있다면 반드시 의사와 상담 후 섭취하세요.
+    - 식단은 매일 다양하게 구성하는 것이 좋습니다.
+    """)
+
+def show_local_plan(height, bmi_status, criteria, preferences, avoid_foods, seed=None):
+    """음식 데이터(food1.csv)만으로 하루 식단을 만들어 끼니별 표와 목표 대비 합계를 표시합니다."""
+    targets = daily_targets(height, bmi_status, criteria)
+    plan = get_meal_planner().plan(targets, avoid_foods, preferences, seed)
+    if plan.empty:
+        st.warning("⚠️ 피할 음식을 제외하니 고를 수 있는 음식이 없어 식단을 만들 수 없습니다. 피할 음식을 줄여 보세요.")
+        return
+    if len(plan) < len(MEALS) * ITEMS_PER_MEAL:
+        st.info("ℹ️ 조건에 맞는 음식이 부족해 일부 칸은 비워 두었습니다.")
+    
+    icons = {"아침": "🌅", "점심": "🌞", "저녁": "🌙"}
+    for meal, rows in plan.groupby("끼니", sort=False):
+        kcal = rows["에너지(kcal)"].sum()
+        st.markdown(f"### {icons.get(meal, '🍽️')} {meal} (약 {kcal:.0f} kcal)")
+        st.dataframe(rows.drop(columns="끼니"), use_container_width=True, hide_index=True)
+    
+    # 하루 목표와 비교
+    totals = plan_totals(plan)
+    day = totals.loc["하루 합계"]
+    st.markdown("### 📊 하루 합계와 목표")
+    cols = st.columns(len(TARGET_COLUMNS))
+    for col, column in zip(cols, TARGET_COLUMNS):
+        col.metric(column, f"{day[column]:.0f}", f"{day[column] - targets[column]:+.0f} (목표 {targets[column]:.0f})",
+                   delta_color="off")
+    st.dataframe(totals.round(1), use_container_width=True)
+
 def run_ml():
     
     
@@ -140,21 +215,30 @@ def run_ml():
     
     # 식단 생성 버튼
     if bmi is not None and age is not None:
-        if st.button("🤖 AI 맞춤 식단 생성하기", type="primary"):
+        method = st.radio(
+            "식단 생성 방식",
+            ["⚡ 빠른 식단 (음식 데이터 기반)", "🤖 AI 맞춤 식단 (Gemini)"],
+            horizontal=True,
+            help="빠른 식단은 음식 데이터에서 목표 열량과 영양소 비율에 맞는 조합을 바로 계산합니다."
+        )
+        
+        if method.startswith("⚡"):
+            col_a, col_b = st.columns(2)
+            if col_a.button("⚡ 식단 만들기", type="primary"):
+                st.session_state.plan_seed = None
+            if col_b.button("🔄 다른 조합 보기"):
+                # 누를 때마다 다른 seed로 비슷한 점수의 다른 조합을 만듦
+                seed = st.session_state.get("plan_seed")
+                st.session_state.plan_seed = 0 if seed is None else seed + 1
+            if "plan_seed" in st.session_state:
+                show_local_plan(user_data['height'], bmi_status, criteria, pref_list, avoid_list,
+                                st.session_state.plan_seed)
+                show_notes()
+        elif st.button("🤖 AI 맞춤 식단 생성하기", type="primary"):
             with st.spinner("AI가 맞춤형 식단을 생성하고 있습니다..."):
-                # age 정보도 get_ai_diet_recommendation에 전달
-                recommendation = get_ai_diet_recommendation(bmi, age, pref_list, avoid_list)
-                
-                # 결과 표시
-                st.markdown(recommendation)
-                
-                # 주의사항
-                st.info("""
-                💡 **참고사항**
-                - 이 식단은 참고용이며, 실제 섭취 시에는 개인의 건강 상태를 고려해주세요.
-                - 특별한 건강 상태나 질환이 있다면 반드시 의사와 상담 후 섭취하세요.
-                - 식단은 매일 다양하게 구성하는 것이 좋습니다.
-                """)
+                # 응답이 도착하는 대로 표시 (전체 응답은 stream_ai_diet_recommendation이 캐시에 저장)
+                st.write_stream(stream_ai_diet_recommendation(bmi, age, pref_list, avoid_list))
+                show_notes()
     else:
         # BMI나 나이 정보가 없을 때 버튼 대신 메시지 표시
         st.error("BMI 및 나이 정보가 없어 식단을 생성할 수 없습니다. 'BMI 계산기' 페이지에서 정보를 입력해 주세요.")
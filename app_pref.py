@@ -1,19 +1,126 @@
-import pandas as pd
+import datetime
+import time
+import uuid
+
 import streamlit as st
 
+from food_ai.core import DAILY_LIMITS, SERVING_SIZE, daily_feedback, serving_totals
+from food_charts import trend_chart
+from food_index import get_food_index
+from food_search import get_search_index
+from intake_log import food_values, get_intake_log, week_of
+
 # ------------------- 상수 -------------------
-DAILY_LIMITS = {"나트륨": 2000, "당류": 50}
-SERVING_SIZE = 300  # 1인분 기준 (300g)
+# 추세 보기 단위 → (표시 이름, 보여줄 기간 수)
+TREND_LEVELS = {"day": ("일별", 30), "week": ("주별", 26), "month": ("월별", 24)}
+# 추세 항목 → (intake_log 컬럼, 하루 권장량)
+TREND_NUTRIENTS = {
+    "칼로리(kcal)": ("kcal", None),
+    "나트륨(mg)": ("sodium", DAILY_LIMITS["나트륨(mg)"]),
+    "당류(g)": ("sugar", DAILY_LIMITS["당류(g)"]),
+    "탄수화물(g)": ("carbs", None),
+    "단백질(g)": ("protein", None),
+    "지방(g)": ("fat", None),
+}
 
 # ------------------- 피드백 함수 -------------------
-def feedback(consumed, limit, nutrient):
-    ratio = consumed / limit * 100
-    if nutrient == "나트륨":
-        msg = "👍 좋아요! 하루 권장량 내에 있어요." if ratio <= 100 else "⚠️ 짠 음식을 조금 줄여보세요."
-        return f"나트륨 섭취량: {consumed:.0f}mg (하루 권장량의 {ratio:.0f}%)<br>→ {msg}"
-    else:
-        msg = "👍 좋아요! 하루 권장량 내에 있어요." if ratio <= 100 else "⚠️ 단 음식을 조금 줄여보세요."
-        return f"당류 섭취량: {consumed:.0f}g (하루 권장량의 {ratio:.0f}%)<br>→ {msg}"
+def feedback(total_na, total_su):
+    """하루 합계 → (나트륨 문구, 당류 문구). 판정은 food_ai.core.daily_feedback."""
+    result = daily_feedback(total_na, total_su)
+    return (
+        f"나트륨 섭취량: {total_na:.0f}mg (하루 권장량의 {result['sodium_pct']:.0f}%)<br>→ {result['daily_sodium']}",
+        f"당류 섭취량: {total_su:.0f}g (하루 권장량의 {result['sugar_pct']:.0f}%)<br>→ {result['daily_sugar']}",
+    )
+
+# ------------------- 섭취 기록 -------------------
+def current_user_id():
+    """
+    주소의 ?user= 값을 사용자 id로 씁니다. 없으면 새로 만들어 주소에 넣으므로
+    새로고침하거나 주소를 북마크해도 같은 기록을 이어서 봅니다.
+
+    인증이 아닙니다: 주소를 아는 사람은 누구나 그 기록을 보고 지울 수 있습니다.
+    추측하기 어렵도록 128비트 무작위 값을 쓰지만, 보안 경계가 필요하면
+    로그인한 사용자 식별자로 바꿔야 합니다.
+    """
+    user_id = st.query_params.get("user")
+    if not user_id:
+        user_id = uuid.uuid4().hex
+        st.query_params["user"] = user_id
+    return user_id
+
+def log_foods(user_id):
+    """선택한 음식을 1인분(300g)씩 오늘 섭취 기록에 추가하고 선택 목록을 비웁니다."""
+    index = get_food_index()
+    log = get_intake_log()
+    for food in st.session_state.food_list:
+        row = index.first(food)
+        if row is not None:
+            log.add(user_id, row["식품코드"], food, SERVING_SIZE, food_values(row, SERVING_SIZE))
+    st.session_state.food_list = []
+    # 위젯 키에 값을 넣으면 default와 충돌해 경고가 뜨므로, 키를 지워 빈 default로 다시 만듦
+    st.session_state.pop("multi_food", None)
+
+def show_today(user_id):
+    """오늘 섭취 기록: 하루 합계 행 하나만 읽어 요약하고, 기록 목록과 삭제를 제공합니다."""
+    log = get_intake_log()
+    totals = log.day_totals(user_id)
+
+    st.markdown("#### 📅 오늘의 섭취 기록")
+    st.caption("🔗 지금 주소를 북마크하면 새로고침하거나 나중에 다시 와도 기록이 유지됩니다. "
+               "로그인이 아니므로 이 주소를 아는 사람은 누구나 기록을 보고 지울 수 있어요. "
+               "주소를 다른 사람과 공유하지 마세요.")
+    if not totals["entries"]:
+        st.info("아직 오늘 기록한 음식이 없어요. 음식을 선택한 뒤 '오늘 기록에 추가'를 눌러보세요.")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("기록한 음식", f"{totals['entries']}개")
+    col2.metric("칼로리", f"{totals['kcal']:.0f} kcal")
+    col3.metric("나트륨", f"{totals['sodium']:.0f} mg")
+    col4.metric("당류", f"{totals['sugar']:.1f} g")
+    for msg in feedback(totals["sodium"], totals["sugar"]):
+        st.markdown(msg, unsafe_allow_html=True)
+
+    with st.expander("🧾 기록 보기 / 삭제"):
+        entries = log.entries(user_id)
+        entries["시각"] = [time.strftime("%H:%M", time.localtime(t)) for t in entries["eaten_at"]]
+        st.dataframe(
+            entries[["시각", "food_name", "amount", "kcal", "sodium", "sugar"]].rename(columns={
+                "food_name": "식품명", "amount": "섭취량(g)", "kcal": "에너지(kcal)",
+                "sodium": "나트륨(mg)", "sugar": "당류(g)",
+            }).round(1),
+            use_container_width=True,
+            hide_index=True
+        )
+        labels = {row.id: f"{row.시각} {row.food_name} ({row.amount:.0f}g)" for row in entries.itertuples()}
+        entry_id = st.selectbox("삭제할 기록", list(labels), format_func=labels.get)
+        if st.button("🗑️ 기록 삭제") and log.remove(user_id, entry_id):
+            st.rerun()
+
+def trend_start(level, periods, now=None):
+    """오늘을 포함해 최근 periods개 기간의 시작 기간 값 (day/week/month 형식)."""
+    today = datetime.date.fromtimestamp(time.time() if now is None else now)
+    if level == "day":
+        return (today - datetime.timedelta(days=periods - 1)).isoformat()
+    if level == "week":
+        return week_of((today - datetime.timedelta(weeks=periods - 1)).isoformat())
+    month = today.year * 12 + today.month - 1 - (periods - 1)
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+def show_trends(user_id):
+    """일/주/월 합계 테이블에서 최근 기간만 읽어 하루 평균 추세를 그립니다."""
+    st.markdown("#### 📈 섭취 추세")
+    col1, col2 = st.columns(2)
+    level = col1.radio("단위", list(TREND_LEVELS), format_func=lambda key: TREND_LEVELS[key][0],
+                       horizontal=True, key="trend_level")
+    label = col2.selectbox("항목", list(TREND_NUTRIENTS), key="trend_nutrient")
+
+    totals = get_intake_log().totals(user_id, level, start=trend_start(level, TREND_LEVELS[level][1]))
+    if totals.empty:
+        st.info("기록이 쌓이면 추세를 볼 수 있어요.")
+        return
+    column, limit = TREND_NUTRIENTS[label]
+    st.plotly_chart(trend_chart(totals, column, label, limit), use_container_width=True)
 
 # ------------------- 분석 함수 -------------------
 def analyze_foods():
@@ -23,34 +130,21 @@ def analyze_foods():
         return
 
     try:
-        df = pd.read_csv('./food1.csv')
+        index = get_food_index()
     except FileNotFoundError:
         st.error("❌ food1.csv 파일을 찾을 수 없습니다.")
         return
 
-    # 숫자형 변환
-    df["나트륨(mg)"] = pd.to_numeric(df["나트륨(mg)"], errors="coerce").fillna(0)
-    df["당류(g)"] = pd.to_numeric(df["당류(g)"], errors="coerce").fillna(0)
-
-    # 선택한 음식 필터링
-    matched = (
-        df[df["식품명"].isin(food_list)]
-        .groupby("식품명", as_index=False)
-        .agg({"나트륨(mg)": "mean", "당류(g)": "mean"})
-    )
+    # 선택한 음식의 식품명별 평균값 (인덱스 조회, 선택 개수에 비례)
+    matched = index.mean_values(food_list, ["나트륨(mg)", "당류(g)"])
 
     if matched.empty:
         st.error("선택한 음식의 영양 정보를 찾을 수 없습니다.")
         return
 
-    # ✅ 100g → 300g (1인분 기준 환산)
-    matched["나트륨(1인분mg)"] = matched["나트륨(mg)"] * (SERVING_SIZE / 100)
-    matched["당류(1인분g)"] = matched["당류(g)"] * (SERVING_SIZE / 100)
-    matched = matched.round({"나트륨(1인분mg)": 1, "당류(1인분g)": 2})
-
-    # ✅ 총 섭취량 계산 (1인분 단위 합계)
-    total_na = matched["나트륨(1인분mg)"].sum()
-    total_su = matched["당류(1인분g)"].sum()
+    # ✅ 100g → 300g (1인분 기준 환산) + 총 섭취량 (1인분 단위 합계)
+    matched, total_na, total_su = serving_totals(matched, SERVING_SIZE)
+    sodium_msg, sugar_msg = feedback(total_na, total_su)
 
     # ------------------- 결과 표시 -------------------
     st.markdown("""
@@ -65,7 +159,7 @@ def analyze_foods():
         <div class="custom-card" style="height:100%;">
             <div style="text-align:center;">
                 <h3 style="color: var(--accent-color); margin-bottom: 1rem;">🧂 나트륨 섭취</h3>
-                <p style="font-size:1.2rem;">{feedback(total_na, DAILY_LIMITS["나트륨"], "나트륨")}</p>
+                <p style="font-size:1.2rem;">{sodium_msg}</p>
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -74,7 +168,7 @@ def analyze_foods():
         <div class="custom-card" style="height:100%;">
             <div style="text-align:center;">
                 <h3 style="color: var(--secondary-color); margin-bottom: 1rem;">🍯 당류 섭취</h3>
-                <p style="font-size:1.2rem;">{feedback(total_su, DAILY_LIMITS["당류"], "당류")}</p>
+                <p style="font-size:1.2rem;">{sugar_msg}</p>
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -113,11 +207,11 @@ def run_pref():
     # ------------------- 초기화 -------------------
     if "food_list" not in st.session_state:
         st.session_state.food_list = []
+    user_id = current_user_id()
 
     # ------------------- 데이터 로드 -------------------
     try:
-        df = pd.read_csv('./food1.csv')
-        food_options = sorted(df["식품명"].dropna().unique().tolist())
+        search_index = get_search_index()
     except FileNotFoundError:
         st.error("❌ food1.csv 파일을 찾을 수 없습니다.")
         return
@@ -129,9 +223,15 @@ def run_pref():
         </div>
     """, unsafe_allow_html=True)
 
-    # ✅ 다중 선택 자동완성
+    # ✅ 서버 측 검색 → 검색 결과 + 이미 선택한 음식만 선택지로 전달
+    query = st.text_input("🔍 음식 검색", placeholder="예: 김치찌개, ㄱㅂ (초성 검색 가능)", key="food_query")
+    food_options = st.session_state.food_list + [
+        food for food in search_index.search(query) if food not in st.session_state.food_list
+    ]
+
+    # ✅ 다중 선택
     selected_foods = st.multiselect(
-        "🍴 음식 검색 및 선택",
+        "🍴 음식 선택",
         options=food_options,
         default=st.session_state.food_list,
         key="multi_food"
@@ -146,6 +246,12 @@ def run_pref():
         for food in st.session_state.food_list:
             st.markdown(f"- {food}")
         st.divider()
-        st.button("섭취량 분석하기", on_click=analyze_foods, use_container_width=True)
+        col1, col2 = st.columns(2)
+        col1.button("섭취량 분석하기", on_click=analyze_foods, use_container_width=True)
+        col2.button("📥 오늘 기록에 추가 (1인분씩)", on_click=log_foods, args=(user_id,), use_container_width=True)
     else:
         st.info("위의 검색창에서 여러 음식을 선택해보세요!")
+
+    st.divider()
+    show_today(user_id)
+    show_trends(user_id)
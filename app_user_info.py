@@ -1,5 +1,7 @@
 import streamlit as st
 
+from food_ai.core import bmi_category, bmi_criteria, body_mass_index, validate_body, weight_change
+
 
 # ============================================================================
 # 1. 초기화 함수
@@ -83,44 +85,9 @@ def get_user_data():
 
 def get_bmi_criteria(age):
     """
-    나이에 따라 다른 BMI 기준을 알려줍니다.
+    나이에 따라 다른 BMI 기준을 알려줍니다. (기준표는 food_ai.core.bmi에 있습니다)
     """
-    if 20 <= age < 40:
-        return {
-            'age_group': '20~40대',
-            'underweight': 18.5,
-            'normal_min': 18.5,
-            'normal_max': 22.9,
-            'overweight_max': 24.9,
-            'description': '일반적인 아시아 기준'
-        }
-    elif 40 <= age < 60:
-        return {
-            'age_group': '40~60대',
-            'underweight': 18.5,
-            'normal_min': 18.5,
-            'normal_max': 23.4,
-            'overweight_max': 25.4,
-            'description': '중년 이후 약간 높은 BMI 권장'
-        }
-    elif age >= 60:
-        return {
-            'age_group': '60대 이상',
-            'underweight': 18.5,
-            'normal_min': 18.5,
-            'normal_max': 24.9,
-            'overweight_max': 27.4,
-            'description': '노년층은 다소 비만 허용 범위 확대'
-        }
-    else:  # 20세 미만
-        return {
-            'age_group': '20세 미만',
-            'underweight': 18.5,
-            'normal_min': 18.5,
-            'normal_max': 22.9,
-            'overweight_max': 24.9,
-            'description': '일반적인 아시아 기준 적용'
-        }
+    return bmi_criteria(age)
 
 
 # ============================================================================
@@ -177,47 +144,22 @@ def calculate_bmi():
     age = st.session_state.user_age
     
     # --- 입력값 검사 ---
-    if not height or height < 140 or height > 250:
-        st.error("키는 140cm ~ 250cm 사이로 입력해주세요.")
+    error = validate_body(height, weight, age)
+    if error:
+        st.error(error)
         clear_results()
         return
     
-    if not weight or weight < 40 or weight > 200:
-        st.error("몸무게는 40kg ~ 200kg 사이로 입력해주세요.")
-        clear_results()
-        return
-    
-    if not age or age < 1 or age > 100:
-        st.error("나이는 1세 ~ 100세 사이로 입력해주세요.")
-        clear_results()
-        return
-    
-    # --- BMI 계산 ---
-    height_m = height / 100.0
-    bmi = weight / (height_m ** 2)
+    # --- BMI 계산 + 나이별 기준으로 상태 판단 (food_ai.core) ---
+    bmi = float(body_mass_index(height, weight))
     st.session_state.bmi_result = bmi
+    st.session_state.status_category = bmi_category(bmi, age)
     
-    # --- 나이에 맞는 BMI 기준 가져오기 ---
-    criteria = get_bmi_criteria(age)
-    
-    # --- BMI 상태 판단 ---
-    if bmi < criteria['underweight']:
-        st.session_state.status_category = 'underweight'
-    elif bmi < criteria['normal_max']:
-        st.session_state.status_category = 'normal'
-    elif bmi <= criteria['overweight_max']:
-        st.session_state.status_category = 'overweight'
-    else:
-        st.session_state.status_category = 'obese'
-    
-    # --- 적정 체중 범위 계산 ---
-    ideal_weight_min = criteria['normal_min'] * (height_m ** 2)
-    ideal_weight_max = criteria['normal_max'] * (height_m ** 2)
-    ideal_weight_mid = (ideal_weight_min + ideal_weight_max) / 2
+    # --- 적정 체중까지의 변화량 (저체중 +, 과체중/비만 -) ---
+    weight_diff = abs(float(weight_change(height, weight, age)))
     
     # --- 액션 메시지 생성 ---
     if st.session_state.status_category == 'underweight':
-        weight_diff = ideal_weight_mid - weight
         st.session_state.action_message = f"""
         <div class="status-value" style="font-size: 2.5rem; font-weight: bold; margin: 1.5rem 0;">
             +{weight_diff:.1f}kg
@@ -232,7 +174,6 @@ def calculate_bmi():
         <div style="font-size: 0.9rem; color: var(--text-color); opacity: 0.7;">현재 체중을 유지하세요</div>
         """
     elif st.session_state.status_category == 'overweight':
-        weight_diff = weight - ideal_weight_max
         st.session_state.action_message = f"""
         <div class="status-value" style="font-size: 2.5rem; font-weight: bold; margin: 1.5rem 0;">
             -{weight_diff:.1f}kg
@@ -240,7 +181,6 @@ def calculate_bmi():
         <div style="font-size: 0.9rem; color: var(--text-color); opacity: 0.7;">감량을 권장합니다</div>
         """
     else:  # obese
-        weight_diff = weight - ideal_weight_max
         st.session_state.action_message = f"""
         <div class="status-value" style="font-size: 2.5rem; font-weight: bold; margin: 1.5rem 0;">
             -{weight_diff:.1f}kg
@@ -0,0 +1,66 @@
+"""
+칼로리 추정 마이크로벤치마크: 선형 추정기(NumPy) vs GradientBoosting 모델.
+
+실행:  python benchmarks/bench_calorie_estimator.py
+"""
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from calorie_estimator import FEATURES, TARGET, feature_matrix, get_linear_estimator
+from food_table import get_food_table
+from model_registry import MODEL_PATH
+
+REPEAT = 2000
+
+# 기존 방식(DataFrame 입력) 비교용 호출에서 나오는 피처 이름 경고는 무시
+warnings.filterwarnings("ignore", message="X has feature names")
+
+
+def timeit(fn, repeat):
+    fn()
+    t = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t) / repeat * 1e6  # us
+
+
+def main():
+    df = get_food_table()
+    X = feature_matrix(df)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    linear = get_linear_estimator()
+    tree = joblib.load(MODEL_PATH)
+
+    row = X[0]
+    print(f"선형 계수: {dict(zip(FEATURES, np.round(linear.coef, 3)))}, 절편 {linear.intercept:.2f}")
+
+    cases = [
+        ("1건: 선형 (NumPy 벡터)", lambda: linear.predict(row), REPEAT),
+        ("1건: GBR (기존 방식, DataFrame 생성 포함)",
+         lambda: tree.predict(pd.DataFrame([row], columns=FEATURES)), REPEAT // 10),
+        ("1건: GBR (NumPy 행렬)", lambda: tree.predict(row[None, :]), REPEAT // 10),
+        (f"{len(X):,}건: 선형", lambda: linear.predict(X), REPEAT // 10),
+        (f"{len(X):,}건: GBR", lambda: tree.predict(X), 10),
+    ]
+    print(f"{'케이스':<40}{'시간(us)':>14}")
+    for name, fn, repeat in cases:
+        print(f"{name:<40}{timeit(fn, repeat):>14.1f}")
+
+    # 정확도: AI 응답처럼 3대 영양소가 모두 있는 행 / 전체 행
+    complete = (X[:, :3] > 0).all(axis=1)
+    for label, mask in [("3대 영양소 기록 행", complete), ("전체 행", np.ones(len(X), bool))]:
+        lin_mae = np.abs(linear.predict(X[mask]) - y[mask]).mean()
+        tree_mae = np.abs(tree.predict(X[mask]) - y[mask]).mean()
+        print(f"MAE ({label}, {mask.sum():,}행): 선형 {lin_mae:.1f} kcal / GBR {tree_mae:.1f} kcal")
+
+
+if __name__ == "__main__":
+    main()
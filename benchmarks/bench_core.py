@@ -0,0 +1,54 @@
+"""
+food_ai.core 벤치마크: Streamlit 없이 페이지 계산을 대량으로 실행합니다.
+  - BMI 상태 분류: 사람 100만 명 (스칼라 반복 vs 배열 한 번)
+  - 음식 피드백: 전체 식품 × 300g (음식마다 food_feedback vs nutrition_rules.evaluate 한 번)
+
+실행:  python benchmarks/bench_core.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from food_ai.core import MACRO_RULES, bmi_category, body_mass_index, evaluate, food_feedback, food_metrics, scale
+from food_metrics import NUTRIENT_COLUMNS, get_food_metrics
+
+PEOPLE = 1_000_000
+SCALAR_SAMPLE = 20_000
+AMOUNT = 300
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    assert "streamlit" not in sys.modules
+
+    rng = np.random.default_rng(0)
+    height = rng.uniform(140, 200, PEOPLE)
+    weight = rng.uniform(40, 130, PEOPLE)
+    age = rng.integers(1, 101, PEOPLE)
+
+    vector_ms, categories = timed(lambda: bmi_category(body_mass_index(height, weight), age))
+    scalar_ms, scalar = timed(lambda: [bmi_category(body_mass_index(h, w), a) for h, w, a in
+                                       zip(height[:SCALAR_SAMPLE], weight[:SCALAR_SAMPLE], age[:SCALAR_SAMPLE])])
+    assert list(categories[:SCALAR_SAMPLE]) == scalar
+    print(f"BMI 분류 {PEOPLE:,}명: 배열 {vector_ms:.0f} ms, "
+          f"스칼라 반복 {scalar_ms / SCALAR_SAMPLE * PEOPLE:.0f} ms (추정, {SCALAR_SAMPLE:,}명 측정)")
+
+    table = get_food_metrics().table[NUTRIENT_COLUMNS]
+    records = table.to_dict("records")
+    scalar_ms, messages = timed(lambda: [food_feedback(food_metrics(scale(values, AMOUNT))) for values in records])
+    vector_ms, evaluated = timed(lambda: evaluate(food_metrics(scale(table, AMOUNT)), MACRO_RULES))
+    assert [m[:3] for m in messages] == evaluated.to_numpy().tolist()
+    print(f"음식 피드백 {len(records):,}개 ({AMOUNT}g): 음식마다 {scalar_ms:.0f} ms, 표 한 번 {vector_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+식품명 검색 응답 시간 벤치마크.
+
+실행:  python benchmarks/bench_food_search.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from food_search import get_search_index
+from food_table import get_food_table
+
+QUERIES = ["ㄱ", "ㄱㅂ", "국ㅂ", "국밥", "밥", "찹쌀도넛", "김치찌개", "ㅈㅊ", "커피", "없는음식"]
+REPEAT = 1000
+
+
+def main():
+    t0 = time.perf_counter()
+    df = get_food_table()
+    index = get_search_index()
+    print(f"인덱스 생성: {(time.perf_counter() - t0) * 1000:.1f} ms ({len(index.names):,}개 식품명)")
+
+    # 비교 기준: 기존처럼 전체 이름을 훑는 부분 문자열 검색
+    names = df["식품명"].unique().tolist()
+
+    print(f"{'검색어':<10}{'인덱스(us)':>12}{'전체 스캔(us)':>16}  상위 결과")
+    for query in QUERIES:
+        t = time.perf_counter()
+        for _ in range(REPEAT):
+            result = index.search(query)
+        indexed = (time.perf_counter() - t) / REPEAT * 1e6
+
+        t = time.perf_counter()
+        for _ in range(REPEAT // 10):
+            [n for n in names if query in n][:20]
+        scan = (time.perf_counter() - t) / (REPEAT // 10) * 1e6
+
+        print(f"{query:<10}{indexed:>12.1f}{scan:>16.1f}  {', '.join(result[:3])}")
+
+
+if __name__ == "__main__":
+    main()
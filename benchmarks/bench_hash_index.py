@@ -0,0 +1,58 @@
+"""
+사진 해시 인덱스 벤치마크: 저장된 해시 100k개에서 해밍 거리 근사 검색 비용.
+
+실행:  python benchmarks/bench_hash_index.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from image_hash import HashIndex
+
+N = 100_000
+QUERIES = 200
+
+
+def main():
+    rng = np.random.default_rng(0)
+    hashes = rng.integers(0, 2 ** 63, N, dtype=np.int64).astype(np.uint64) * np.uint64(2) + \
+        rng.integers(0, 2, N, dtype=np.int64).astype(np.uint64)
+
+    index = HashIndex(max_entries=N)
+    t = time.perf_counter()
+    for i, h in enumerate(hashes.tolist()):
+        index.add(h, i)
+    print(f"추가: {N:,}개 {(time.perf_counter() - t) * 1000:.0f} ms")
+
+    # 저장된 해시에서 3비트를 뒤집은 질의 (거의 같은 사진) / 무작위 질의 (새 사진)
+    targets = rng.integers(0, N, QUERIES)
+    flips = rng.integers(0, 64, (QUERIES, 3))
+    near = [int(hashes[t]) ^ sum(1 << int(b) for b in set(f)) for t, f in zip(targets, flips)]
+    far = rng.integers(0, 2 ** 63, QUERIES, dtype=np.int64).tolist()
+
+    for label, queries in [("거의 같은 사진", near), ("새 사진", far)]:
+        t = time.perf_counter()
+        found = sum(index.lookup(q) is not None for q in queries)
+        per_ms = (time.perf_counter() - t) / len(queries) * 1000
+        print(f"검색 ({label}): {per_ms:.3f} ms/건, 찾음 {found}/{len(queries)}")
+
+    # 비교 기준: 파이썬 int로 하나씩 XOR + bit_count
+    stored = hashes.tolist()
+    t = time.perf_counter()
+    for q in near[:10]:
+        min((h ^ q).bit_count() for h in stored)
+    print(f"검색 (파이썬 루프): {(time.perf_counter() - t) / 10 * 1000:.3f} ms/건")
+
+    # 가득 찬 상태에서 추가 (LRU 교체)
+    t = time.perf_counter()
+    for q in far:
+        index.add(q, -1)
+    print(f"LRU 교체 추가: {(time.perf_counter() - t) / len(far) * 1000:.3f} ms/건, 크기 {len(index):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+이미지 전처리 벤치마크: 휴대폰 사진 크기(4~12MP) 합성 이미지의 축소/재인코딩 결과.
+
+실행:  python benchmarks/bench_image_prep.py
+"""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from image_prep import prepare_image
+
+SIZES = [(2304, 1728), (3024, 4032), (4000, 3000)]  # 4MP, 12MP(세로), 12MP
+
+
+def synthetic_photo(width, height, seed=0):
+    """그라데이션 + 잡음으로 실제 사진과 비슷한 압축률의 JPEG을 만듭니다."""
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 180, width)[None, :, None] + np.linspace(0, 60, height)[:, None, None]
+    pixels = np.clip(gradient + rng.normal(0, 12, (height, width, 3)), 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG", quality=92)
+    return buffer.getvalue()
+
+
+def main():
+    print(f"{'원본':<14}{'형식':<6}  결과")
+    for width, height in SIZES:
+        raw = synthetic_photo(width, height)
+        for fmt in ("JPEG", "WEBP"):
+            prepared = prepare_image(raw, fmt=fmt)
+            ratio = len(prepared.data) / len(raw) * 100
+            print(f"{f'{width}×{height}':<14}{fmt:<6}  {prepared.summary()} ({ratio:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+콜드 스타트 import 시간 프로파일 (python -X importtime).
+
+각 대상을 새 파이썬 프로세스에서 import하고, 전체 import 시간과
+무거운 의존성(google.generativeai, sklearn, PIL, joblib, plotly)이 로드되었는지 보여줍니다.
+홈 화면(app1)은 streamlit 단독과 비슷해야 합니다. (streamlit 자체가 PIL, plotly 일부를 불러옴)
+
+실행:  python benchmarks/bench_import_time.py [-v]    (-v: 대상별 상위 모듈 목록)
+"""
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = ["streamlit", "app1", "app_user_info", "app_eda", "app_pref", "app_ml", "app_img"]
+HEAVY = ["google.generativeai", "sklearn", "PIL", "joblib", "plotly"]
+TOP = 8
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile(target):
+    """대상 모듈을 import할 때의 [(모듈, self us, 누적 us, 깊이), ...]."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return rows
+
+
+def main():
+    verbose = "-v" in sys.argv
+    print(f"{'대상':<16}{'import(ms)':>12}  무거운 의존성")
+    for target in TARGETS:
+        try:
+            rows = profile(target)
+        except RuntimeError as e:
+            print(f"{target:<16}{'실패':>12}  {e}")
+            continue
+        total = sum(cumulative for _, _, cumulative, depth in rows if depth == 0) / 1000
+        loaded = {name for name, *_ in rows}
+        heavy = [h for h in HEAVY if any(n == h or n.startswith(h + ".") for n in loaded)]
+        print(f"{target:<16}{total:>12.0f}  {', '.join(heavy) or '-'}")
+        if verbose:
+            for name, _, cumulative, _ in sorted(rows, key=lambda r: -r[2])[:TOP]:
+                print(f"{'':<18}{cumulative / 1000:>8.0f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
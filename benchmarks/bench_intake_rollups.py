@@ -0,0 +1,92 @@
+"""
+섭취 기록 합계 테이블 벤치마크: 3년치 합성 기록 100만 개(보통 사용자 99명 + 기록이 많은 사용자 1명)에서
+일/주/월 합계 테이블 조회 vs 기록 원본 재집계(SQL GROUP BY, pandas groupby) 시간,
+기록 추가/삭제 한 번의 시간 (합계 갱신 포함).
+
+실행:  python benchmarks/bench_intake_rollups.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from intake_log import NUTRIENT_COLUMNS, TOTAL_COLUMNS, IntakeLog, week_of
+
+ENTRIES = 1_000_000
+USERS = 100
+HEAVY_ENTRIES = 100_000  # user0의 기록 수 (나머지는 나머지 사용자가 나눔)
+YEARS = 3
+BATCH_DAYS = 30  # 한 번에 가져오는 기록 범위 (add_many 단위)
+REPEAT = 20
+FIELDS = list(NUTRIENT_COLUMNS)
+
+
+def synthetic_entries(rng, start, count):
+    """(음식 코드, 이름, 섭취량, 영양값 dict, 시각) 목록 (시각 순서)."""
+    eaten_at = np.sort(start + rng.uniform(0, YEARS * 365 * 86400, count))
+    amounts = rng.choice([100.0, 200.0, 300.0], count)
+    values = rng.gamma(2.0, [150, 20, 8, 6, 5, 300], (count, len(FIELDS))) * (amounts / 100)[:, None]
+    return [(f"D{code:03d}", f"음식{code}", float(amount), dict(zip(FIELDS, row)), float(t))
+            for code, amount, row, t in zip(rng.integers(0, 500, count), amounts, values.tolist(), eaten_at)]
+
+
+def timed(func, repeat=REPEAT):
+    """func 실행 평균 시간(ms)과 마지막 결과."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    rng = np.random.default_rng(0)
+    start = time.time() - YEARS * 365 * 86400
+    with tempfile.TemporaryDirectory() as tmp:
+        log = IntakeLog(os.path.join(tmp, "intake.sqlite3"))
+
+        # 1. 적재: 사용자별로 BATCH_DAYS일치씩 add_many (합계는 날짜별로 증분 갱신)
+        t = time.perf_counter()
+        for u in range(USERS):
+            count = HEAVY_ENTRIES if u == 0 else (ENTRIES - HEAVY_ENTRIES) // (USERS - 1)
+            entries = synthetic_entries(rng, start, count)
+            bounds = np.searchsorted([e[4] for e in entries],
+                                     start + np.arange(0, YEARS * 365 + BATCH_DAYS, BATCH_DAYS) * 86400)
+            for a, b in zip(bounds[:-1], bounds[1:]):
+                log.add_many(f"user{u}", entries[a:b])
+        elapsed = time.perf_counter() - t
+        print(f"적재: 기록 {ENTRIES:,}개 {elapsed:.1f} s ({ENTRIES / elapsed:,.0f}개/s, 합계 갱신 포함)")
+
+        for user in ("user0", "user1"):
+            print(f"\n{user}: 기록 {log.totals(user, 'month')['entries'].sum():,}개")
+            print(f"{'단위':<6}{'기간 수':>8}{'합계 테이블':>14}{'SQL 재집계':>14}{'pandas 재집계':>16}")
+            for level, period_of in [
+                ("day", lambda days: days),
+                ("week", lambda days: days.map(week_of)),
+                ("month", lambda days: days.str[:7]),
+            ]:
+                rollup_ms, totals = timed(lambda: log.totals(user, level))
+
+                def pandas_rescan():
+                    raw = log.history(user)
+                    return raw.groupby(period_of(raw["day"]))[FIELDS].sum()
+
+                sql_ms, rescanned = timed(lambda: log.rescan_totals(user, level), 5)
+                pandas_ms, _ = timed(pandas_rescan, 5)
+                assert (totals["period"] == rescanned["period"]).all()
+                assert np.allclose(totals[TOTAL_COLUMNS[1:]], rescanned[TOTAL_COLUMNS[1:]])
+                print(f"{level:<6}{len(totals):>8}{rollup_ms:>12.2f}ms{sql_ms:>12.2f}ms{pandas_ms:>14.2f}ms")
+
+        # 2. 기록 하나 추가/삭제 (하루 + 주 + 월 합계 갱신 포함)
+        user = "user0"
+        values = dict.fromkeys(FIELDS, 100.0)
+        add_ms, ids = timed(lambda: [log.add(user, "D001", "음식1", 100, values) for _ in range(100)], 1)
+        remove_ms, _ = timed(lambda: [log.remove(user, i) for i in ids], 1)
+        print(f"\n기록 1개 추가 {add_ms / 100:.3f} ms, 삭제 {remove_ms / 100:.3f} ms (기록 {ENTRIES:,}개 상태)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+영양소 도넛 차트 렌더링 벤치마크: 기존 px.pie vs graph_objects vs 캐시된 Figure.
+
+시간에는 st.plotly_chart가 하는 변환(return_figure_from_figure_or_data + to_json)을 포함합니다.
+
+실행:  python benchmarks/bench_macro_donut.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import plotly
+import plotly.express as px
+import plotly.io as pio
+
+from food_charts import MACRO_COLORS, MACRO_LABELS, macro_donut
+from food_metrics import get_food_metrics
+
+REPEAT = 200
+FOODS = 50
+
+
+def to_spec(figure):
+    """st.plotly_chart가 프런트엔드로 보내기 전에 하는 작업."""
+    figure = plotly.tools.return_figure_from_figure_or_data(figure, validate_figure=True)
+    return pio.to_json(figure, validate=False)
+
+
+def express_donut(name, carb, protein, fat, amount=250):
+    """기존 app_eda 방식."""
+    ratio = amount / 100
+    fig = px.pie(
+        names=MACRO_LABELS,
+        values=[carb * ratio, protein * ratio, fat * ratio],
+        color=MACRO_LABELS,
+        color_discrete_sequence=MACRO_COLORS,
+        hole=0.4,
+        title=f"{name}의 영양 비율 ({amount:.0f}g 기준)"
+    )
+    fig.update_traces(textinfo='percent+label', pull=[0.05, 0.05, 0.05])
+    fig.update_layout(legend_title="영양소", margin=dict(t=50, b=20, l=0, r=0))
+    return fig
+
+
+def timeit(fn, args, repeat):
+    t = time.perf_counter()
+    for i in range(repeat):
+        fn(*args[i % len(args)])
+    return (time.perf_counter() - t) / repeat * 1000  # ms
+
+
+def main():
+    table = get_food_metrics().table.iloc[:FOODS]
+    args = [(name, row["탄수화물(g)"], row["단백질(g)"], row["지방(g)"]) for name, row in table.iterrows()]
+
+    express_donut(*args[0])  # 템플릿 로드 등 첫 호출 비용 제외
+    uncached = macro_donut.__wrapped__
+    cases = [
+        ("px.pie (기존)", lambda *a: to_spec(express_donut(*a)), REPEAT // 4),
+        ("graph_objects (캐시 없음)", lambda *a: to_spec(uncached(*a)), REPEAT),
+    ]
+    macro_donut.cache_clear()
+    for a in args:
+        macro_donut(*a)
+    cases.append(("graph_objects + LRU 캐시 (적중)", lambda *a: to_spec(macro_donut(*a)), REPEAT))
+
+    print(f"{'방식':<32}{'시간(ms)':>10}")
+    for label, fn, repeat in cases:
+        print(f"{label:<32}{timeit(fn, args, repeat):>10.2f}")
+    print(f"캐시: {macro_donut.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+로컬 식단 플래너 벤치마크: 하루 식단 1개 생성 시간 (목표 < 100 ms)과 목표 대비 오차.
+
+실행:  python benchmarks/bench_meal_planner.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from food_ai.core import bmi_criteria
+from food_table import get_food_table
+from meal_planner import KCAL_PER_KG, TARGET_COLUMNS, daily_targets, get_meal_planner, plan_totals
+
+BUDGET_MS = 100
+CASES = [
+    ((), ()),
+    (("돼지", "김치", "땅콩"), ("연어", "두부")),
+    (("우유", "새우"), ("닭가슴살", "브로콜리")),
+]
+SEEDS = [None, 1, 2, 3, 4]
+
+
+def main():
+    get_food_table()
+    t = time.perf_counter()
+    planner = get_meal_planner()
+    print(f"플래너 준비: {(time.perf_counter() - t) * 1000:.1f} ms (후보 {len(planner):,}개)")
+
+    times, errors = [], []
+    for height, age in [(160, 25), (175, 45), (168, 65)]:
+        criteria = bmi_criteria(age)
+        for status in KCAL_PER_KG:
+            targets = daily_targets(height, status, criteria)
+            for avoid, prefer in CASES:
+                for seed in SEEDS:
+                    t = time.perf_counter()
+                    plan = planner.plan(targets, avoid, prefer, seed)
+                    times.append((time.perf_counter() - t) * 1000)
+                    day = plan_totals(plan).loc["하루 합계"]
+                    errors.append([abs(day[c] / targets[c] - 1) * 100 for c in TARGET_COLUMNS])
+
+    times = np.array(times)
+    errors = np.array(errors)
+    print(f"식단 {len(times)}개: 평균 {times.mean():.1f} ms, p95 {np.percentile(times, 95):.1f} ms, "
+          f"최대 {times.max():.1f} ms (목표 {BUDGET_MS} ms 이내: {'OK' if times.max() < BUDGET_MS else '초과'})")
+    for column, mean, worst in zip(TARGET_COLUMNS, errors.mean(axis=0), errors.max(axis=0)):
+        print(f"  {column:<12} 목표 대비 오차 평균 {mean:.1f}%, 최대 {worst:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
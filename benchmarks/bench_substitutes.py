@@ -0,0 +1,47 @@
+"""
+대안 음식 인덱스 벤치마크: 로드 시 KDTree 구축 시간과 음식 하나당 조회 시간.
+
+실행:  python benchmarks/bench_substitutes.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from food_index import get_food_index
+from food_metrics import get_food_metrics
+from food_substitutes import TARGETS, SubstituteIndex
+from food_table import get_food_table
+
+SAMPLES = 2000
+
+
+def main():
+    df = get_food_table()
+    index, metrics = get_food_index(), get_food_metrics()
+
+    t = time.perf_counter()
+    substitutes = SubstituteIndex(df, index, metrics)
+    print(f"인덱스 구축: {(time.perf_counter() - t) * 1000:.1f} ms "
+          f"(음식 {len(substitutes.names):,}개, 분류 {len(set(substitutes.categories))}개)")
+
+    names = np.random.default_rng(0).choice(substitutes.names, SAMPLES)
+    for same_category in (False, True):
+        for target in TARGETS:
+            times, empty = [], 0
+            for name in names:
+                t = time.perf_counter()
+                found, _ = substitutes.neighbors(name, target, k=5, same_category=same_category)
+                times.append((time.perf_counter() - t) * 1e6)
+                empty += len(found) == 0
+            times = np.array(times)
+            scope = "같은 분류" if same_category else "전체"
+            print(f"{scope:<6}{target:<8} 조회 평균 {times.mean():.0f} µs, p95 {np.percentile(times, 95):.0f} µs, "
+                  f"최대 {times.max():.0f} µs (대안 없음 {empty}/{SAMPLES})")
+
+
+if __name__ == "__main__":
+    main()
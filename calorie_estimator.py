@@ -0,0 +1,53 @@
+import numpy as np
+
+from food_table import get_derived
+
+# ============================================================
+# 선형(Atwater형) 칼로리 추정기
+# ============================================================
+# 에너지(kcal) ≈ a·탄수화물 + b·단백질 + c·지방 + d·당류 + e·나트륨 + 절편
+# 계수는 food1.csv에서 탄수화물/단백질/지방이 모두 기록된 행(0은 결측으로 간주)에
+# 최소제곱으로 맞춘 값입니다. (Atwater 계수 4/4/9에 가까움)
+# DataFrame 없이 NumPy 배열만 받으므로 1건은 행렬-벡터 곱 한 번,
+# 수천 건도 한 번의 행렬 곱으로 계산합니다.
+
+FEATURES = ["탄수화물(g)", "단백질(g)", "지방(g)", "당류(g)", "나트륨(mg)"]
+TARGET = "에너지(kcal)"
+
+
+def feature_matrix(df):
+    """DataFrame에서 입력 피처 행렬(float64, 행 x 피처)을 한 번에 만듭니다."""
+    return np.ascontiguousarray(df[FEATURES].to_numpy(dtype=np.float64))
+
+
+class LinearCalorieEstimator:
+    """FEATURES 순서의 영양소 벡터 → 칼로리 선형 모델."""
+
+    def __init__(self, coef=None, intercept=0.0):
+        self.coef = None if coef is None else np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+
+    def fit(self, X, y):
+        X = np.asarray(X, dtype=np.float64)
+        A = np.hstack([X, np.ones((len(X), 1))])
+        solution, *_ = np.linalg.lstsq(A, np.asarray(y, dtype=np.float64), rcond=None)
+        self.coef = solution[:-1]
+        self.intercept = float(solution[-1])
+        return self
+
+    def predict(self, X):
+        """(피처 수,) 벡터면 스칼라, (n, 피처 수) 행렬이면 길이 n 배열을 반환합니다."""
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+
+def fit_estimator(df):
+    """3대 영양소가 모두 기록된 행으로 선형 추정기를 맞춥니다."""
+    X = feature_matrix(df)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    complete = (X[:, :3] > 0).all(axis=1)
+    return LinearCalorieEstimator().fit(X[complete], y[complete])
+
+
+def get_linear_estimator():
+    """공유 음식 데이터 테이블로 맞춘 선형 추정기 (테이블이 다시 로드되면 다시 맞춤)."""
+    return get_derived("calorie_linear", fit_estimator)
@@ -0,0 +1 @@
+"""맛춤식 음식 AI: Streamlit 페이지와 분리된 계산 코드."""
@@ -0,0 +1,52 @@
+"""
+Streamlit 없이 호출할 수 있는 순수 계산 함수 모음.
+
+페이지(app_*.py)는 입력을 읽고 결과를 그리기만 하고, 계산은 여기 함수를 호출합니다.
+같은 함수를 벤치마크, 일괄 처리, 다른 화면에서도 그대로 쓸 수 있습니다.
+"""
+from food_ai.core.analysis import (
+    ANALYSIS_CONFIG,
+    ANALYSIS_SCHEMA,
+    CORRECTION_FIELDS,
+    NUTRIENT_FIELDS,
+    build_prompt,
+    correct_kcal,
+    extract_number,
+    nutrient_row,
+    parse_analysis,
+    totals_table,
+)
+from food_ai.core.bmi import (
+    BMI_CRITERIA,
+    CATEGORIES,
+    STATUS_LABELS,
+    bmi_category,
+    bmi_criteria,
+    body_mass_index,
+    ideal_weight_range,
+    validate_body,
+    weight_change,
+)
+from food_ai.core.nutrition import (
+    SERVING_SIZE,
+    daily_feedback,
+    energy_ratios,
+    food_feedback,
+    food_metrics,
+    intake_levels,
+    scale,
+    serving_totals,
+)
+from food_ai.core.nutrition_rules import (
+    DAILY_LIMITS,
+    DAILY_RULES,
+    INTAKE_RULES,
+    MACRO_RULES,
+    RULES,
+    case_code,
+    evaluate,
+    evaluate_one,
+    limit_pcts,
+    messages_for,
+    rule_codes,
+)
@@ -0,0 +1,145 @@
+import json
+import re
+
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# AI 사진 분석 응답 파싱 / 칼로리 보정 (순수 함수)
+# ============================================================
+# Gemini 응답(JSON 또는 이전 자유 텍스트)을 영양 성분 dict로 읽고, 여러 사진의 결과를
+# 칼로리 보정 모델(predict를 가진 객체) 한 번 호출로 보정합니다. 화면 표시는 app_img가 합니다.
+
+# Gemini 응답 JSON 필드 → (표시 이름, 정규식 대체 파싱용 키워드)
+NUTRIENT_FIELDS = {
+    "kcal": ("열량(kcal)", "열량"),
+    "carbs": ("탄수화물(g)", "탄수화물"),
+    "protein": ("단백질(g)", "단백질"),
+    "fat": ("지방(g)", "지방"),
+    "sugar": ("당류(g)", "당류"),
+    "sodium": ("나트륨(mg)", "나트륨"),
+}
+
+# 응답을 이 스키마의 JSON으로 받아 json.loads 한 번으로 파싱합니다.
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "food_name": {"type": "string"},
+        "serving": {"type": "string"},
+        **{field: {"type": "number"} for field in NUTRIENT_FIELDS},
+        "comment": {"type": "string"},
+    },
+    "required": ["food_name", *NUTRIENT_FIELDS],
+}
+
+ANALYSIS_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": ANALYSIS_SCHEMA,
+}
+
+
+def extract_number(text, keyword):
+    """AI 응답 텍스트에서 특정 키워드의 숫자 값을 추출합니다."""
+    pattern = rf"{keyword}.*?(\d+(?:\.\d+)?)"
+    match = re.search(pattern, text)
+    return float(match.group(1)) if match else None
+
+
+def extract_section(text, start, end_marker=None):
+    """AI 응답 텍스트에서 특정 섹션의 내용을 추출합니다."""
+    start_idx = text.find(start)
+    if start_idx == -1:
+        return ""
+    start_idx += len(start)
+    if end_marker:
+        end_idx = text.find(end_marker, start_idx)
+        if end_idx == -1:
+            end_idx = len(text)
+    else:
+        end_idx = len(text)
+    return text[start_idx:end_idx].strip()
+
+
+def extract_food_name(text):
+    """AI 응답의 '음식 이름:' 줄에서 음식 이름을 추출합니다."""
+    match = re.search(r"음식\s*(?:이름|명)\s*[:：]\s*([^\n]+)", text)
+    return match.group(1).strip(" *#") if match else None
+
+
+def _to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_analysis(text):
+    """
+    AI 응답을 {"food_name", "serving", "kcal", ..., "comment"} dict로 파싱합니다.
+    JSON 응답이면 한 번에 읽고, 아니면 (이전 캐시 등 자유 텍스트) 정규식으로 추출합니다.
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        result = {field: _to_number(data.get(field)) for field in NUTRIENT_FIELDS}
+        result.update(
+            food_name=(data.get("food_name") or "").strip() or None,
+            serving=data.get("serving") or "",
+            comment=data.get("comment") or "",
+        )
+        return result
+
+    result = {field: extract_number(text, keyword) for field, (_, keyword) in NUTRIENT_FIELDS.items()}
+    result.update(food_name=extract_food_name(text), serving="", comment=text)
+    return result
+
+
+CORRECTION_FIELDS = ["carbs", "protein", "fat", "sugar", "sodium"]  # calorie_estimator.FEATURES 순서
+
+
+def build_prompt(user_food_name=""):
+    """사진 한 장 분석용 프롬프트."""
+    return f"""
+            당신은 한국 음식 영양분석에 전문적인 영양 코치입니다.
+            음식 사진을 보고 영양 성분을 1인분 기준으로 추정하세요.
+            음식 이름: {user_food_name if user_food_name else "사진 속 음식"}
+            JSON으로 답하세요. food_name은 추정한 음식 이름, serving은 1인분 양(예: "1그릇(500g)"),
+            kcal은 열량(kcal), carbs/protein/fat/sugar는 g, sodium은 mg 단위 숫자,
+            comment는 영양 평가와 건강한 섭취 팁(한국어)입니다.
+            """
+
+
+def correct_kcal(regressor, results):
+    """분석 결과 목록의 보정 칼로리를 한 번의 predict로 계산합니다. (계산할 수 없으면 None)"""
+    corrected = [None] * len(results)
+    if regressor is None:
+        return corrected
+    rows = [i for i, r in enumerate(results) if r and all(r[f] is not None for f in CORRECTION_FIELDS)]
+    if rows:
+        # 학습 때와 같은 피처 순서의 NumPy 행렬
+        X = np.array([[results[i][f] for f in CORRECTION_FIELDS] for i in rows], dtype=np.float64)
+        for i, value in zip(rows, regressor.predict(X)):
+            corrected[i] = float(value)
+    return corrected
+
+
+def nutrient_row(result):
+    """분석 결과 → 표 한 행 (표시 이름 기준)."""
+    return {label: result[field] for field, (label, _) in NUTRIENT_FIELDS.items()}
+
+
+def totals_table(titles, results, corrected):
+    """사진별 영양 성분 + 합계 행 표."""
+    rows = []
+    for title, result, kcal in zip(titles, results, corrected):
+        if result is not None:
+            rows.append({"사진": title, "음식": result["food_name"] or "-",
+                         **nutrient_row(result), "보정 칼로리(kcal)": kcal})
+    table = pd.DataFrame(rows)
+    if len(rows) > 1:
+        totals = table.drop(columns=["사진", "음식"]).sum(numeric_only=True, min_count=1)
+        table = pd.concat([table, pd.DataFrame([{"사진": "합계", "음식": f"{len(rows)}개", **totals}])],
+                          ignore_index=True)
+    return table
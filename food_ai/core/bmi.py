@@ -0,0 +1,114 @@
+import numpy as np
+
+# ============================================================
+# BMI 계산 / 나이별 기준 / 상태 분류 (순수 함수)
+# ============================================================
+# Streamlit 상태(st.session_state) 없이 값만 받아 값을 돌려줍니다.
+# 키·몸무게·나이는 스칼라 또는 같은 길이의 배열 모두 받습니다. (배열이면 배열 반환)
+
+HEIGHT_RANGE = (140, 250)  # cm
+WEIGHT_RANGE = (40, 200)   # kg
+AGE_RANGE = (1, 100)       # 세
+
+# 나이 구간 경계: 20세 미만 / 20~40대 / 40~60대 / 60대 이상
+AGE_BOUNDS = [20, 40, 60]
+BMI_CRITERIA = [
+    {
+        'age_group': '20세 미만',
+        'underweight': 18.5,
+        'normal_min': 18.5,
+        'normal_max': 22.9,
+        'overweight_max': 24.9,
+        'description': '일반적인 아시아 기준 적용'
+    },
+    {
+        'age_group': '20~40대',
+        'underweight': 18.5,
+        'normal_min': 18.5,
+        'normal_max': 22.9,
+        'overweight_max': 24.9,
+        'description': '일반적인 아시아 기준'
+    },
+    {
+        'age_group': '40~60대',
+        'underweight': 18.5,
+        'normal_min': 18.5,
+        'normal_max': 23.4,
+        'overweight_max': 25.4,
+        'description': '중년 이후 약간 높은 BMI 권장'
+    },
+    {
+        'age_group': '60대 이상',
+        'underweight': 18.5,
+        'normal_min': 18.5,
+        'normal_max': 24.9,
+        'overweight_max': 27.4,
+        'description': '노년층은 다소 비만 허용 범위 확대'
+    },
+]
+
+CATEGORIES = ["underweight", "normal", "overweight", "obese"]
+STATUS_LABELS = {"underweight": "저체중", "normal": "정상", "overweight": "과체중", "obese": "비만"}
+
+
+def _criteria_column(age, key):
+    """나이(스칼라/배열) → 해당 나이 구간의 기준값 key (같은 모양)."""
+    groups = np.searchsorted(AGE_BOUNDS, age, side="right")
+    return np.array([criteria[key] for criteria in BMI_CRITERIA])[groups]
+
+
+def bmi_criteria(age):
+    """나이에 따른 BMI 기준표 dict (복사본)."""
+    return dict(BMI_CRITERIA[int(np.searchsorted(AGE_BOUNDS, age, side="right"))])
+
+
+def validate_body(height, weight, age):
+    """입력값 검사: 범위를 벗어나면 오류 메시지, 정상이면 None."""
+    if not height or not HEIGHT_RANGE[0] <= height <= HEIGHT_RANGE[1]:
+        return f"키는 {HEIGHT_RANGE[0]}cm ~ {HEIGHT_RANGE[1]}cm 사이로 입력해주세요."
+    if not weight or not WEIGHT_RANGE[0] <= weight <= WEIGHT_RANGE[1]:
+        return f"몸무게는 {WEIGHT_RANGE[0]}kg ~ {WEIGHT_RANGE[1]}kg 사이로 입력해주세요."
+    if not age or not AGE_RANGE[0] <= age <= AGE_RANGE[1]:
+        return f"나이는 {AGE_RANGE[0]}세 ~ {AGE_RANGE[1]}세 사이로 입력해주세요."
+    return None
+
+
+def body_mass_index(height, weight):
+    """BMI = 몸무게(kg) / 키(m)²."""
+    return np.asarray(weight) / (np.asarray(height) / 100.0) ** 2
+
+
+def bmi_category(bmi, age):
+    """
+    BMI 상태 코드 (underweight / normal / overweight / obese).
+    나이별 기준: 저체중 < underweight ≤ 정상 < normal_max ≤ 과체중 ≤ overweight_max < 비만
+    """
+    bmi = np.asarray(bmi, dtype=np.float64)
+    codes = np.select(
+        [bmi < _criteria_column(age, 'underweight'),
+         bmi < _criteria_column(age, 'normal_max'),
+         bmi <= _criteria_column(age, 'overweight_max')],
+        [0, 1, 2],
+        3,
+    )
+    categories = np.array(CATEGORIES)[codes]
+    return str(categories) if categories.ndim == 0 else categories
+
+
+def ideal_weight_range(height, age):
+    """나이별 정상 BMI 범위에 해당하는 (최소, 최대) 체중(kg)."""
+    height_m2 = (np.asarray(height) / 100.0) ** 2
+    return _criteria_column(age, 'normal_min') * height_m2, _criteria_column(age, 'normal_max') * height_m2
+
+
+def weight_change(height, weight, age):
+    """
+    권장 체중 변화(kg, 부호 포함): 저체중이면 정상 범위 중간까지 +, 과체중/비만이면
+    정상 범위 최대까지 -, 정상이면 0.
+    """
+    weight = np.asarray(weight, dtype=np.float64)
+    low, high = ideal_weight_range(height, age)
+    bmi = body_mass_index(height, weight)
+    underweight = bmi < _criteria_column(age, 'underweight')
+    over = bmi >= _criteria_column(age, 'normal_max')
+    return np.select([underweight, over], [(low + high) / 2 - weight, high - weight], 0.0)
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from food_ai.core.nutrition_rules import (
+    DAILY_RULES,
+    INTAKE_RULES,
+    MACRO_RULES,
+    evaluate_one,
+    limit_pcts,
+    messages_for,
+    rule_codes,
+)
+
+# ============================================================
+# 영양값 환산 / 3대 영양소 비율 / 피드백 (순수 함수)
+# ============================================================
+# 음식 영양 정보(app_eda)와 나트륨·당류 분석(app_pref)에서 쓰는 계산입니다.
+# 값은 100g 기준 dict, 또는 컬럼 → 배열(DataFrame)로 받아 같은 형태로 돌려줍니다.
+# 판정 기준과 문구는 nutrition_rules(같은 패키지)의 규칙 테이블을 그대로 씁니다.
+
+SERVING_SIZE = 300  # 1인분 기준 (300g)
+
+
+def scale(values, amount):
+    """
+    100g 기준 영양값 → 섭취량(g/ml) 기준.
+    values가 DataFrame이고 amount가 배열이면 행마다 다른 섭취량을 곱합니다.
+    """
+    factor = np.asarray(amount, dtype=np.float64) / 100
+    if isinstance(values, pd.DataFrame):
+        return values.mul(factor, axis=0) if factor.ndim else values * float(factor)
+    if isinstance(values, dict):
+        return {column: value * factor for column, value in values.items()}
+    return values * factor
+
+
+def energy_ratios(energy, carb, protein, fat):
+    """3대 영양소가 에너지에서 차지하는 비율(%) 배열. 에너지가 0 이하이면 0."""
+    energy = np.asarray(energy, dtype=np.float64)
+    safe = np.where(energy > 0, energy, 1.0)
+    ratios = np.stack([np.asarray(carb) * 4, np.asarray(protein) * 4, np.asarray(fat) * 9]) / safe * 100
+    return np.where(energy > 0, ratios, 0.0)
+
+
+def food_metrics(values):
+    """
+    영양값(섭취량 기준) → 피드백 규칙 입력 dict:
+    영양값 + sodium_pct/sugar_pct(하루 권장량 대비 %) + carb/protein/fat_ratio(에너지 비율 %).
+    """
+    metrics = dict(values)
+    metrics.update(limit_pcts(values))
+    ratios = energy_ratios(values["에너지(kcal)"], values["탄수화물(g)"], values["단백질(g)"], values["지방(g)"])
+    metrics.update(zip(["carb_ratio", "protein_ratio", "fat_ratio"], ratios))
+    return metrics
+
+
+def food_feedback(metrics):
+    """
+    음식 하나의 피드백 문구 목록: 3대 영양소 에너지 비율 + (해당하면) 나트륨·당류 경고.
+    metrics는 food_metrics() 또는 FoodMetrics.get() 결과입니다.
+    """
+    feedback = [messages_for(name, int(rule_codes(metrics, name))) for name in MACRO_RULES]
+    intake = evaluate_one(metrics, ["sodium_warning", "sugar_warning"])
+    return feedback + [message for message in intake.values() if message]
+
+
+def intake_levels(metrics):
+    """섭취량 기준 나트륨·당류 신호등과 경고 문구 dict (nutrition_rules.INTAKE_RULES)."""
+    return evaluate_one(metrics, INTAKE_RULES)
+
+
+def serving_totals(per_100g, serving=SERVING_SIZE):
+    """
+    음식별 100g 기준 나트륨·당류 표 → (1인분 환산 표, 나트륨 합계(mg), 당류 합계(g)).
+    1인분 값은 나트륨 소수 1자리, 당류 소수 2자리로 반올림한 뒤 합산합니다.
+    """
+    table = per_100g.copy()
+    table["나트륨(1인분mg)"] = (table["나트륨(mg)"] * (serving / 100)).round(1)
+    table["당류(1인분g)"] = (table["당류(g)"] * (serving / 100)).round(2)
+    return table, table["나트륨(1인분mg)"].sum(), table["당류(1인분g)"].sum()
+
+
+def daily_feedback(total_na, total_su):
+    """하루 나트륨·당류 합계 → 하루 권장량 대비 비율(%)과 평가 문구 dict."""
+    values = limit_pcts({"나트륨(mg)": total_na, "당류(g)": total_su})
+    result = {column: float(value) for column, value in values.items()}
+    result.update(evaluate_one(values, DAILY_RULES))
+    return result
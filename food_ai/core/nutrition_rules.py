@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# 영양 피드백 규칙 테이블 + 벡터 평가기
+# ============================================================
+# 음식 영양 정보(app_eda)와 나트륨·당류 분석(app_pref)이 같은 규칙을 쓰도록
+# if/elif 분기를 선언형 표 하나로 모았습니다.
+#
+# 규칙 = 대상 컬럼 + 순서대로 검사할 조건 목록 [(연산자, 기준값, 메시지), ...] + 기본 메시지
+# 첫 번째로 맞는 조건의 메시지를 고릅니다. (if/elif/else와 같음)
+# evaluate()는 DataFrame(또는 컬럼 → 배열 dict) 전체에 np.select 한 번씩으로 규칙을
+# 적용하므로 음식 하나, 하루 기록, 전체 식품 목록을 같은 코드로 평가합니다.
+
+DAILY_LIMITS = {"나트륨(mg)": 2000, "당류(g)": 50}  # 하루 권장량
+LIMIT_PCT_COLUMNS = {"나트륨(mg)": "sodium_pct", "당류(g)": "sugar_pct"}
+
+_OPS = {"<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal}
+
+RULES = {
+    # 3대 영양소 에너지 비율 (%)
+    "carb": {
+        "column": "carb_ratio",
+        "cases": [(">", 60, "🍚 탄수화물 비중이 높아요. 밥이나 빵류 섭취를 줄여보세요."),
+                  ("<", 40, "🍞 탄수화물 비중이 낮아요. 에너지를 충분히 섭취하세요.")],
+        "default": "✅ 탄수화물 비율이 적정합니다.",
+    },
+    "protein": {
+        "column": "protein_ratio",
+        "cases": [("<", 15, "💪 단백질 섭취가 적습니다. 달걀, 닭가슴살, 두부를 추가해보세요."),
+                  (">", 25, "🥩 단백질이 많아요. 탄수화물과의 균형을 확인해보세요.")],
+        "default": "✅ 단백질 섭취가 적당합니다.",
+    },
+    "fat": {
+        "column": "fat_ratio",
+        "cases": [(">", 30, "🍟 지방 섭취가 높아요. 튀김이나 가공식품을 줄이세요."),
+                  ("<", 10, "🥑 지방이 적어요. 견과류나 올리브유로 보충해보세요.")],
+        "default": "✅ 지방 섭취도 적정합니다.",
+    },
+    # 하루 권장량 대비 비율(%) 신호등
+    "sodium_level": {
+        "column": "sodium_pct",
+        "cases": [("<", 30, "🟢"), ("<", 70, "🟠")],
+        "default": "🔴",
+    },
+    "sugar_level": {
+        "column": "sugar_pct",
+        "cases": [("<", 30, "🟢"), ("<", 70, "🟠")],
+        "default": "🔴",
+    },
+    # 한 번 섭취량 경고 (해당 없으면 메시지 없음)
+    "sodium_warning": {
+        "column": "나트륨(mg)",
+        "cases": [(">", 1500, "⚠️ 나트륨이 높아요. 짠 음식 섭취를 줄이세요.")],
+        "default": None,
+    },
+    "sugar_warning": {
+        "column": "당류(g)",
+        "cases": [(">", 30, "⚠️ 당류가 많아요. 단 음료나 디저트는 자제하세요.")],
+        "default": None,
+    },
+    # 하루 섭취 합계 평가
+    "daily_sodium": {
+        "column": "sodium_pct",
+        "cases": [("<=", 100, "👍 좋아요! 하루 권장량 내에 있어요.")],
+        "default": "⚠️ 짠 음식을 조금 줄여보세요.",
+    },
+    "daily_sugar": {
+        "column": "sugar_pct",
+        "cases": [("<=", 100, "👍 좋아요! 하루 권장량 내에 있어요.")],
+        "default": "⚠️ 단 음식을 조금 줄여보세요.",
+    },
+}
+
+MACRO_RULES = ["carb", "protein", "fat"]
+INTAKE_RULES = ["sodium_level", "sugar_level", "sodium_warning", "sugar_warning"]
+DAILY_RULES = ["daily_sodium", "daily_sugar"]
+
+
+def limit_pcts(values):
+    """나트륨/당류 값 → 하루 권장량 대비 비율(%) dict. (sodium_pct, sugar_pct)"""
+    return {
+        pct: np.asarray(values[column], dtype=np.float64) / DAILY_LIMITS[column] * 100
+        for column, pct in LIMIT_PCT_COLUMNS.items()
+    }
+
+
+def rule_codes(values, name):
+    """
+    규칙 하나를 평가해 맞은 조건 번호 배열을 반환합니다. 아무 조건도 맞지 않으면 len(cases).
+    values는 DataFrame 또는 컬럼 이름 → 값(스칼라/배열) dict입니다.
+    """
+    rule = RULES[name]
+    column = np.asarray(values[rule["column"]], dtype=np.float64)
+    conditions = [_OPS[op](column, threshold) for op, threshold, _ in rule["cases"]]
+    return np.select(conditions, np.arange(len(conditions)), len(conditions)).astype(np.int8)
+
+
+def case_code(name, label):
+    """
+    메시지(또는 메시지 앞부분, 예: "🔴", "🍟")로 규칙의 조건 번호를 찾습니다.
+    기본 메시지이면 len(cases). rule_codes() 결과와 비교할 때 조건 순서 대신 사용합니다.
+    맞는 메시지가 없거나 둘 이상이면 KeyError.
+    """
+    rule = RULES[name]
+    messages = [message for _, _, message in rule["cases"]] + [rule["default"]]
+    codes = [code for code, message in enumerate(messages) if message is not None and message.startswith(label)]
+    if len(codes) != 1:
+        raise KeyError(f"{name} 규칙에서 '{label}' 메시지를 하나로 찾을 수 없습니다.")
+    return codes[0]
+
+
+def messages_for(name, codes):
+    """조건 번호(배열 또는 정수) → 메시지. 기본 메시지가 None인 규칙은 None."""
+    rule = RULES[name]
+    table = np.array([message for _, _, message in rule["cases"]] + [rule["default"]], dtype=object)
+    return table[codes]
+
+
+def evaluate(values, names=None):
+    """
+    여러 규칙을 한 번에 평가해 규칙 이름별 메시지 컬럼 DataFrame을 반환합니다.
+    names를 생략하면 values에 대상 컬럼이 있는 규칙을 모두 평가합니다.
+    """
+    if names is None:
+        names = [name for name, rule in RULES.items() if rule["column"] in values]
+    result = {name: messages_for(name, np.atleast_1d(rule_codes(values, name))) for name in names}
+    return pd.DataFrame(result, index=values.index if isinstance(values, pd.DataFrame) else None)
+
+
+def evaluate_one(values, names):
+    """스칼라 값 하나(음식 한 개, 하루 합계 한 개)의 규칙 메시지 dict."""
+    return {name: messages_for(name, int(rule_codes(values, name))) for name in names}
@@ -0,0 +1,159 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# food1.csv → 바이너리 컬럼 캐시 빌드 / 메모리 맵 로드
+# ============================================================
+# CSV(특히 한글 문자열) 파싱은 워커 프로세스가 뜰 때마다 반복되는 비용입니다.
+# 빌드 단계에서 CSV를 다음 구조의 단일 파일로 변환해 두고,
+# 앱은 np.memmap으로 열어 여러 Streamlit 워커가 같은 페이지를 공유합니다.
+#
+#   [MAGIC 8B][헤더 길이 uint32][JSON 헤더][패딩]   ← 이후 오프셋은 여기부터
+#   [숫자 블록: float64 (컬럼 수 x 행 수)]
+#   [문자열 테이블: 중복 제거된 문자열을 \0으로 이어 붙인 UTF-8]
+#   [문자열 컬럼별 uint32 ID 배열]
+#
+# 헤더에는 원본 CSV의 sha256이 들어 있어, CSV가 바뀌면 캐시는 무시되고
+# CSV를 직접 읽습니다. 캐시 갱신:  python food_cache.py
+#
+# 한계: 워커끼리 실제로 공유되는 것은 숫자 블록(메모리 맵 페이지)뿐입니다.
+# 파이썬 str 객체는 프로세스 간에 공유할 수 없으므로, 문자열 컬럼은 워커마다
+# 문자열 테이블을 한 번 디코딩하고(중복 제거된 문자열 1벌) ID 배열로 object 컬럼을
+# 만듭니다. CSV 파싱은 건너뛰지만 문자열 컬럼 메모리는 워커마다 따로 듭니다.
+
+MAGIC = b"FOODTBL\x01"
+FORMAT_VERSION = 1
+ALIGN = 64
+
+
+def cache_path_for(csv_path):
+    """CSV 경로에 대응하는 캐시 파일 경로 (food1.csv → food1.cache)."""
+    return os.path.splitext(csv_path)[0] + ".cache"
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def build_cache(df, source_digest, cache_path):
+    """
+    타입 정리가 끝난 DataFrame을 바이너리 캐시 파일로 저장합니다.
+    float64 컬럼은 숫자 블록으로, 나머지는 문자열 테이블로 저장됩니다.
+    """
+    numeric_cols = [c for c in df.columns if df[c].dtype == np.float64]
+    text_cols = [c for c in df.columns if c not in numeric_cols]
+
+    # 숫자 블록: 컬럼 단위로 연속된 float64 배열
+    numeric = np.ascontiguousarray(df[numeric_cols].to_numpy(dtype="<f8").T)
+
+    # 문자열 인터닝: 모든 문자열 컬럼이 하나의 테이블을 공유
+    strings = {}
+    ids = {}
+    for col in text_cols:
+        codes = np.empty(len(df), dtype="<u4")
+        for i, value in enumerate(df[col].tolist()):
+            codes[i] = strings.setdefault(value, len(strings))
+        ids[col] = codes
+    string_blob = "\0".join(strings).encode("utf-8")
+
+    # 섹션 오프셋은 헤더 뒤 데이터 영역 시작 기준 (모두 ALIGN 단위 정렬)
+    sections = [numeric.tobytes(), string_blob] + [ids[col].tobytes() for col in text_cols]
+    offsets = []
+    pos = 0
+    for data in sections:
+        offsets.append(pos)
+        pos = _align(pos + len(data))
+
+    header = {
+        "format": FORMAT_VERSION,
+        "source_sha256": source_digest,
+        "rows": len(df),
+        "columns": list(df.columns),
+        "numeric": {"columns": numeric_cols, "offset": offsets[0]},
+        "strings": {"count": len(strings), "offset": offsets[1], "length": len(string_blob)},
+        "text": {col: {"offset": off} for col, off in zip(text_cols, offsets[2:])},
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(MAGIC) + 4 + len(header_bytes))
+
+    # 임시 파일에 쓴 뒤 교체 → 이미 메모리 맵으로 열린 기존 파일은 영향 없음
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header_bytes).to_bytes(4, "little"))
+        f.write(header_bytes)
+        for offset, data in zip(offsets, sections):
+            f.write(b"\0" * (data_start + offset - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+def read_header(cache_path):
+    """캐시 파일 헤더를 읽습니다. 형식이 맞지 않으면 None."""
+    try:
+        with open(cache_path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            size = int.from_bytes(f.read(4), "little")
+            header = json.loads(f.read(size).decode("utf-8"))
+            header["data_start"] = _align(len(MAGIC) + 4 + size)
+    except (OSError, ValueError):
+        return None
+    if header.get("format") != FORMAT_VERSION:
+        return None
+    return header
+
+
+def load_cache(cache_path, source_digest):
+    """
+    캐시 파일을 메모리 맵으로 열어 DataFrame을 만듭니다.
+
+    숫자 컬럼은 복사 없이 메모리 맵 위의 읽기 전용 배열을 그대로 사용합니다.
+    문자열 컬럼은 이 프로세스에서 만든 object 배열입니다. (워커 간 공유되지 않음)
+    캐시가 없거나, 손상되었거나, source_digest(원본 CSV 해시)와 다르면 None을 반환합니다.
+    """
+    header = read_header(cache_path)
+    if header is None or header["source_sha256"] != source_digest:
+        return None
+
+    try:
+        mm = np.memmap(cache_path, dtype=np.uint8, mode="r")
+    except (OSError, ValueError):
+        return None
+
+    n = header["rows"]
+    base = header["data_start"]
+    numeric_cols = header["numeric"]["columns"]
+    start = base + header["numeric"]["offset"]
+    numeric = mm[start:start + 8 * n * len(numeric_cols)].view("<f8").reshape(len(numeric_cols), n)
+
+    meta = header["strings"]
+    start = base + meta["offset"]
+    blob = mm[start:start + meta["length"]].tobytes().decode("utf-8")
+    table = np.array(blob.split("\0") if meta["count"] else [], dtype=object)
+
+    columns = {}
+    for i, col in enumerate(numeric_cols):
+        columns[col] = numeric[i]
+    for col, info in header["text"].items():
+        start = base + info["offset"]
+        ids = mm[start:start + 4 * n].view("<u4")
+        columns[col] = table[ids]
+
+    # copy=False: 컬럼별 블록을 유지해 메모리 맵 페이지를 그대로 공유
+    return pd.DataFrame({col: columns[col] for col in header["columns"]}, copy=False)
+
+
+if __name__ == "__main__":
+    import food_table
+
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else food_table.FOOD_CSV_PATH
+    path = build_cache(food_table.read_food_csv(csv_path),
+                       food_table.file_digest(csv_path),
+                       cache_path_for(csv_path))
+    print(f"✅ 캐시 생성 완료: {path} ({os.path.getsize(path):,} bytes)")
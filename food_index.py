@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from food_table import NUMERIC_COLUMNS, get_derived
+
+# ============================================================
+# 식품명 / 식품코드 해시 인덱스
+# ============================================================
+# df[df["식품명"] == choice] 같은 불리언 필터는 상호작용마다 전체 행(약 14.6k)을
+# 훑습니다. 테이블이 로드될 때 한 번 인덱스를 만들어 두면 조회, 여러 음식 합산,
+# 음식별 평균 벡터 계산이 선택한 음식 수(k)에만 비례합니다.
+# 같은 이름이 여러 행에 있는 식품(1,505개)은 모든 행 위치를 보관합니다.
+
+
+class FoodIndex:
+    """식품명 → 행 위치 배열, 식품코드 → 행 위치, 식품명별 평균 영양값."""
+
+    def __init__(self, df):
+        self.df = df
+
+        # 식품명 → 행 위치 (중복 이름 포함, 파일 순서 유지)
+        self.name_rows = df.groupby("식품명", sort=True).indices
+        self.names = np.array(list(self.name_rows), dtype=object)
+        self._name_id = {name: i for i, name in enumerate(self.names)}
+
+        # 식품코드 → 행 위치 (코드는 고유값)
+        self.code_row = {code: i for i, code in enumerate(df["식품코드"].tolist())}
+
+        # 식품명별 평균 영양값 (이름 순서 = self.names)
+        self.numeric_columns = [c for c in NUMERIC_COLUMNS if c in df.columns]
+        values = df[self.numeric_columns].to_numpy(dtype=np.float64)
+        counts = np.empty(len(self.names), dtype=np.int64)
+        ids = np.empty(len(df), dtype=np.int64)
+        for i, rows in enumerate(self.name_rows.values()):
+            ids[rows] = i
+            counts[i] = len(rows)
+        sums = np.zeros((len(self.names), len(self.numeric_columns)))
+        np.add.at(sums, ids, values)
+        self.name_means = sums / counts[:, None]
+
+    def __contains__(self, name):
+        return name in self._name_id
+
+    def rows(self, name):
+        """식품명에 해당하는 모든 행 위치 (없으면 빈 배열)."""
+        return self.name_rows.get(name, np.empty(0, dtype=np.int64))
+
+    def first(self, name):
+        """식품명의 첫 번째 행 (기존 df[df["식품명"] == name].iloc[0]과 동일). 없으면 None."""
+        rows = self.name_rows.get(name)
+        return None if rows is None else self.df.iloc[rows[0]]
+
+    def by_code(self, code):
+        """식품코드의 행. 없으면 None."""
+        pos = self.code_row.get(code)
+        return None if pos is None else self.df.iloc[pos]
+
+    def mean_values(self, names, columns=None):
+        """
+        선택한 식품명들의 평균 영양값 DataFrame (식품명 + 컬럼).
+
+        groupby("식품명").mean()과 같은 결과를 이름 순으로 돌려주며,
+        데이터에 없는 이름은 건너뜁니다.
+        """
+        columns = columns or self.numeric_columns
+        col_ids = [self.numeric_columns.index(c) for c in columns]
+        ids = sorted({self._name_id[n] for n in names if n in self._name_id})
+        result = pd.DataFrame(self.name_means[np.ix_(ids, col_ids)], columns=columns)
+        result.insert(0, "식품명", self.names[ids])
+        return result
+
+
+def get_food_index():
+    """공유 음식 데이터 테이블에 대한 인덱스 (테이블이 다시 로드되면 새로 생성)."""
+    return get_derived("food_index", FoodIndex)
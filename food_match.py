@@ -0,0 +1,87 @@
+import numpy as np
+
+from food_index import get_food_index
+from food_search import normalize
+from food_table import get_derived
+
+# ============================================================
+# 자유 텍스트 음식 이름 → food1.csv 식품명 근사 매칭
+# ============================================================
+# Gemini가 돌려준 음식 이름이나 사용자가 입력한 이름은 데이터베이스 표기와
+# 정확히 같지 않습니다. ("돼지 국밥" / "국밥_돼지머리")
+# 식품명마다 문자 2-gram 집합을 미리 역색인해 두고, 검색어와 겹치는 2-gram 수로
+# Dice 유사도( 2·|A∩B| / (|A|+|B|) )를 한 번의 bincount로 계산합니다.
+# "피자_치즈 피자"처럼 분류가 앞에 붙은 이름은 '_' 뒤 부분("치즈 피자")도
+# 별칭으로 색인해 둘 중 높은 점수를 사용합니다.
+
+HIGH_CONFIDENCE = 0.85  # 이 이상이면 같은 음식으로 보고 AI 호출 없이 DB 값을 사용
+
+
+def _name_grams(key):
+    """앞/뒤 경계를 포함한 2-gram 집합. ("국밥" → {"^국", "국밥", "밥$"})"""
+    padded = f"^{key}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class FoodMatcher:
+    """식품명 2-gram 역색인 기반 근사 매칭기."""
+
+    def __init__(self, names):
+        self.names = np.array(names, dtype=object)
+        # 별칭 0..N-1은 전체 이름, 그 뒤는 '_' 뒤 부분 (owner = 원래 식품명 위치)
+        aliases = [normalize(name) for name in names]
+        owners = list(range(len(names)))
+        for i, name in enumerate(names):
+            if "_" in name:
+                aliases.append(normalize(name.split("_", 1)[1]))
+                owners.append(i)
+        self._owners = np.array(owners[len(names):], dtype=np.int64)
+
+        postings = {}
+        sizes = np.empty(len(aliases), dtype=np.float64)
+        for i, alias in enumerate(aliases):
+            grams = _name_grams(alias)
+            sizes[i] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self._postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._sizes = sizes
+
+    def scores(self, query):
+        """모든 식품명에 대한 Dice 유사도 배열 (0~1)."""
+        n = len(self.names)
+        grams = _name_grams(normalize(query))
+        lists = [self._postings[g] for g in grams if g in self._postings]
+        if not lists:
+            return np.zeros(n)
+        shared = np.bincount(np.concatenate(lists), minlength=len(self._sizes))
+        alias_scores = 2.0 * shared / (len(grams) + self._sizes)
+        scores = alias_scores[:n].copy()
+        scores[self._owners] = np.maximum(scores[self._owners], alias_scores[n:])
+        return scores
+
+    def _top(self, scores, k):
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((self._sizes[top], -scores[top]))]  # 동점이면 짧은 이름 우선
+        return [(self.names[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def match(self, query, k=3):
+        """가장 비슷한 식품명 k개를 [(식품명, 유사도), ...]로 반환합니다. (유사도 내림차순)"""
+        if not query or not query.strip():
+            return []
+        return self._top(self.scores(query), k)
+
+    def match_many(self, queries, k=3):
+        """여러 이름을 한 번에 매칭합니다. 입력 순서대로 match() 결과 목록을 반환합니다."""
+        return [self.match(q, k) for q in queries]
+
+
+def get_food_matcher():
+    """공유 음식 데이터 테이블의 식품명 매칭기."""
+    return get_derived("food_matcher", lambda df: FoodMatcher(get_food_index().names.tolist()))
+
+
+def match_food(query, k=3):
+    """가장 비슷한 식품명 k개 단축 함수."""
+    return get_food_matcher().match(query, k)
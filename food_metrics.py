@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from food_ai.core import MACRO_RULES, energy_ratios, limit_pcts, rule_codes
+from food_index import get_food_index
+from food_table import get_derived
+
+# ============================================================
+# 식품별 파생 지표 테이블 (100g 기준, 로드 시 한 번 계산)
+# ============================================================
+# 음식을 고를 때마다 스칼라 파이썬으로 다시 계산하던 값들을 전체 식품(약 14.6k)에
+# 대해 한 번에 벡터 연산으로 만들어 둡니다. 페이지는 조회 후 섭취량/100만 곱합니다.
+#   - 3대 영양소 에너지 비율 (carb_ratio, protein_ratio, fat_ratio, %)
+#   - 하루 권장량 대비 나트륨/당류 비율 (sodium_pct, sugar_pct, 100g 기준 %)
+#   - 에너지 비율 피드백 규칙 결과 (*_rule: nutrition_rules의 조건 번호)
+# 에너지 비율과 피드백 결과는 섭취량과 무관하고, 영양값과 *_pct는 섭취량에 비례합니다.
+# 식품명이 여러 행에 있으면 첫 번째 행 값을 사용합니다. (FoodIndex.first와 동일)
+
+NUTRIENT_COLUMNS = ["에너지(kcal)", "탄수화물(g)", "단백질(g)", "지방(g)", "당류(g)", "나트륨(mg)"]
+SCALED_COLUMNS = NUTRIENT_COLUMNS + ["sodium_pct", "sugar_pct"]
+RATIO_COLUMNS = ["carb_ratio", "protein_ratio", "fat_ratio"]
+RULE_COLUMNS = [f"{name}_rule" for name in MACRO_RULES]
+
+
+class FoodMetrics:
+    """식품명 → 100g 기준 영양값 + 파생 지표 (조회, 여러 음식 일괄 조회)."""
+
+    def __init__(self, df, index):
+        first_rows = np.fromiter((rows[0] for rows in index.name_rows.values()), dtype=np.int64)
+        values = df[NUTRIENT_COLUMNS].to_numpy(dtype=np.float64)[first_rows]
+        energy, carb, protein, fat, sugar, sodium = values.T
+
+        table = pd.DataFrame(values, columns=NUTRIENT_COLUMNS, index=pd.Index(index.names, name="식품명"))
+        for column, pct in limit_pcts(table).items():
+            table[column] = pct
+        for column, ratios in zip(RATIO_COLUMNS, energy_ratios(energy, carb, protein, fat)):
+            table[column] = ratios
+        for name, column in zip(MACRO_RULES, RULE_COLUMNS):
+            table[column] = rule_codes(table, name)
+
+        self.table = table
+        self._name_id = {name: i for i, name in enumerate(index.names)}
+        self._scaled = table[SCALED_COLUMNS].to_numpy()
+        self._ratios = table[RATIO_COLUMNS].to_numpy()
+        self._rules = table[RULE_COLUMNS].to_numpy()
+
+    def __contains__(self, name):
+        return name in self._name_id
+
+    def get(self, name, amount=100):
+        """섭취량(g/ml) 기준 지표 dict. 없는 식품명이면 None."""
+        i = self._name_id.get(name)
+        if i is None:
+            return None
+        result = dict(zip(SCALED_COLUMNS, (self._scaled[i] * (amount / 100)).tolist()))
+        result.update(zip(RATIO_COLUMNS, self._ratios[i].tolist()))
+        result.update(zip(RULE_COLUMNS, self._rules[i].tolist()))
+        return result
+
+    def query(self, names, amounts=100):
+        """
+        여러 음식의 지표 DataFrame (식품명 + 지표 컬럼, 입력 순서 유지).
+        amounts는 하나의 값 또는 음식별 섭취량 배열입니다. 데이터에 없는 이름은 건너뜁니다.
+        """
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=np.float64), (len(names),))
+        keep = [i for i, name in enumerate(names) if name in self._name_id]
+        ids = [self._name_id[names[i]] for i in keep]
+        result = self.table.iloc[ids].reset_index()
+        result[SCALED_COLUMNS] = self._scaled[ids] * (amounts[keep] / 100)[:, None]
+        return result
+
+
+def get_food_metrics():
+    """공유 음식 데이터 테이블의 식품별 파생 지표."""
+    return get_derived("food_metrics", lambda df: FoodMetrics(df, get_food_index()))
@@ -0,0 +1,142 @@
+import re
+
+import numpy as np
+
+from food_index import get_food_index
+from food_table import get_derived
+
+# ============================================================
+# 식품명 서버 측 검색 (부분 문자열 + 초성)
+# ============================================================
+# selectbox/multiselect에 14k개 식품명을 통째로 넘기면 렌더링마다 전체 목록이
+# 브라우저로 전송됩니다. 대신 서버에서 입력한 검색어로 상위 N개만 골라 보여줍니다.
+#
+# - 공백과 '_'는 무시합니다. ("찹쌀도넛" → "도넛_찹쌀 도넛")
+# - 초성 검색을 지원합니다. ("ㄱㅂ" → "국밥", "국ㅂ" → "국밥")
+# - 정렬: 앞부분 일치 우선 → 짧은 이름 우선 → 가나다순
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_SET = set(CHOSEONG)
+_IGNORED = str.maketrans("", "", " _\t")
+
+DEFAULT_LIMIT = 20
+
+
+def normalize(text):
+    """검색용 정규화: 소문자, 공백/'_' 제거."""
+    return text.lower().translate(_IGNORED)
+
+
+def to_choseong(text):
+    """한글 음절을 초성으로 바꿉니다. 그 외 문자는 그대로 둡니다. ("국밥" → "ㄱㅂ")"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            out.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _query_pattern(query):
+    """초성이 섞인 검색어를 정규식으로 바꿉니다. ("국ㅂ" → 국[ㅂ바-빟])"""
+    parts = []
+    for ch in query:
+        if ch in _CHOSEONG_SET:
+            start = HANGUL_BASE + CHOSEONG.index(ch) * 588
+            parts.append(f"[{ch}{chr(start)}-{chr(start + 587)}]")
+        else:
+            parts.append(re.escape(ch))
+    return re.compile("".join(parts))
+
+
+def _grams(text):
+    """길이 1이면 글자 자체, 그 이상이면 2-gram 목록."""
+    if len(text) < 2:
+        return set(text)
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _build_postings(keys):
+    postings = {}
+    for i, key in enumerate(keys):
+        for gram in _grams(key) | set(key):
+            postings.setdefault(gram, []).append(i)
+    # ID는 정렬 순위 순서이므로, 목록도 순위 순으로 정렬된 상태
+    return {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+
+class FoodSearchIndex:
+    """식품명 n-gram / 초성 역색인."""
+
+    def __init__(self, names):
+        keys = [normalize(n) for n in names]
+        # ID를 (길이, 이름) 순위로 부여 → 후보를 ID 순으로 훑으면 곧 정렬 순서
+        order = sorted(range(len(names)), key=lambda i: (len(keys[i]), keys[i]))
+        self.names = [names[i] for i in order]
+        self.keys = [keys[i] for i in order]
+        self.cho_keys = [to_choseong(k) for k in self.keys]
+        self._name_postings = _build_postings(self.keys)
+        self._cho_postings = _build_postings(self.cho_keys)
+
+    def _candidates(self, postings, query):
+        lists = []
+        for gram in _grams(query):
+            ids = postings.get(gram)
+            if ids is None:
+                return np.empty(0, dtype=np.int32)
+            lists.append(ids)
+        lists.sort(key=len)
+        result = lists[0]
+        for ids in lists[1:]:
+            result = np.intersect1d(result, ids, assume_unique=True)
+            if not len(result):
+                break
+        return result
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """검색어와 일치하는 식품명 상위 limit개를 반환합니다. 빈 검색어면 가장 짧은 이름부터."""
+        query = normalize(query)
+        if not query:
+            return self.names[:limit]
+
+        if any(ch in _CHOSEONG_SET for ch in query):
+            candidates = self._candidates(self._cho_postings, to_choseong(query))
+            finder = _query_pattern(query).search
+            keys = self.keys
+
+            def position(i):
+                m = finder(keys[i])
+                return m.start() if m else -1
+        else:
+            candidates = self._candidates(self._name_postings, query)
+            keys = self.keys
+
+            def position(i):
+                return keys[i].find(query)
+
+        # 후보는 (길이, 이름) 순이므로 앞부분 일치가 limit개 모이면 바로 종료
+        prefix, others = [], []
+        for i in candidates.tolist():
+            pos = position(i)
+            if pos == 0:
+                prefix.append(i)
+                if len(prefix) >= limit:
+                    break
+            elif pos > 0 and len(others) < limit:
+                others.append(i)
+        ranked = prefix + others
+        return [self.names[i] for i in ranked[:limit]]
+
+
+def get_search_index():
+    """공유 음식 데이터 테이블의 식품명 검색 인덱스."""
+    return get_derived("food_search", lambda df: FoodSearchIndex(get_food_index().names.tolist()))
+
+
+def search_foods(query, limit=DEFAULT_LIMIT):
+    """식품명 검색 단축 함수."""
+    return get_search_index().search(query, limit)
@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from food_ai.core import case_code, rule_codes
+from food_index import get_food_index
+from food_metrics import get_food_metrics
+from food_table import get_derived
+
+# ============================================================
+# 영양 공간 최근접 이웃 인덱스 ("더 건강한 대안" 추천)
+# ============================================================
+# 음식마다 (탄수화물, 단백질, 지방, 당류, 에너지, 나트륨) 100g 기준 벡터를 표준화(z-score)해
+# KDTree에 넣어 둡니다. 음식 하나를 주면 영양 구성이 가장 비슷한 음식 중에서
+# 문제가 된 영양소(나트륨/당류/지방 비율)가 충분히 낮은 음식만 가까운 순서로 돌려줍니다.
+#
+# - 전체 트리 1개 + 식품코드 분류(앞 CATEGORY_PREFIX_LEN자리, 예: D202)별 트리를 로드 시 한 번 만듭니다.
+# - 트리마다 문제 영양소 값을 정렬해 두어, 조건(값이 충분히 낮음)에 맞는 음식 수를 이진 탐색으로 셉니다.
+#   · 0개이면 바로 빈 결과
+#   · BRUTE_FORCE_MAX개 이하이면 그 음식들과의 거리만 직접 계산
+#   · 그보다 많으면 조건에 맞는 비율로 가져올 이웃 수를 정해 트리에서 조회 (모자라면 두 배씩 넓힘)
+# 식품명이 여러 행에 있으면 첫 번째 행 값을 사용합니다. (FoodMetrics와 동일)
+
+FEATURE_COLUMNS = ["탄수화물(g)", "단백질(g)", "지방(g)", "당류(g)", "에너지(kcal)", "나트륨(mg)"]
+CATEGORY_PREFIX_LEN = 4
+FETCH_FACTOR = 8
+BRUTE_FORCE_MAX = 2000
+MIN_IMPROVEMENT = 0.2  # 문제 영양소가 원래 음식보다 20% 이상 낮아야 대안으로 인정
+
+# 문제 영양소 → (비교할 지표 컬럼, 표시 제목)
+TARGETS = {
+    "sodium": ("나트륨(mg)", "🧂 나트륨이 더 낮은 비슷한 음식"),
+    "sugar": ("당류(g)", "🍬 당류가 더 낮은 비슷한 음식"),
+    "fat": ("fat_ratio", "🍟 지방 비율(%)이 더 낮은 비슷한 음식"),
+}
+
+# 문제 영양소 → [(규칙 이름, 문제로 볼 조건의 메시지 앞부분), ...] (하나라도 맞으면 문제)
+FLAG_CASES = {
+    "sodium": [("sodium_level", "🔴"), ("sodium_warning", "⚠️")],
+    "sugar": [("sugar_level", "🔴"), ("sugar_warning", "⚠️")],
+    "fat": [("fat", "🍟")],
+}
+
+
+def flagged_nutrients(metrics):
+    """
+    섭취량 기준 지표 dict(FoodMetrics.get 결과)에서 문제가 된 영양소 목록.
+    나트륨/당류는 하루 권장량 대비 신호등이 빨강이거나 한 번 섭취량 경고가 있을 때,
+    지방은 에너지 비율이 적정 범위를 넘을 때입니다. (nutrition_rules 기준)
+    """
+    return [target for target, cases in FLAG_CASES.items()
+            if any(int(rule_codes(metrics, name)) == case_code(name, label) for name, label in cases)]
+
+
+class SubstituteIndex:
+    """식품명 → 영양 구성이 비슷하면서 문제 영양소가 낮은 음식 (전체 또는 같은 분류 안에서)."""
+
+    def __init__(self, df, index, metrics):
+        table = metrics.table
+        first_rows = np.fromiter((rows[0] for rows in index.name_rows.values()), dtype=np.int64)
+        categories = df["식품코드"].str[:CATEGORY_PREFIX_LEN].to_numpy()[first_rows]
+
+        values = table[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        std = values.std(axis=0)
+        self.vectors = (values - values.mean(axis=0)) / np.where(std > 0, std, 1.0)
+        self.names = table.index.to_numpy()
+        self.categories = categories
+        self.scores = {target: table[column].to_numpy() for target, (column, _) in TARGETS.items()}
+        self._table = table
+        self._name_id = {name: i for i, name in enumerate(self.names)}
+
+        # 전체 트리 + 분류별 트리 (트리 안 위치 → 전체 위치 배열과 함께)
+        # + 트리별·영양소별 (정렬된 값, 그 순서의 전체 위치)
+        groups = {None: np.arange(len(self.names))}
+        groups.update(pd.Series(categories).groupby(categories).indices)
+        self._trees = {}
+        self._sorted = {}
+        for category, ids in groups.items():
+            self._trees[category] = (KDTree(self.vectors[ids]), ids)
+            for target, scores in self.scores.items():
+                order = ids[np.argsort(scores[ids], kind="stable")]
+                self._sorted[category, target] = (scores[order], order)
+
+    def __contains__(self, name):
+        return name in self._name_id
+
+    def category(self, name):
+        """식품명의 분류 코드 (식품코드 앞자리). 없으면 None."""
+        i = self._name_id.get(name)
+        return None if i is None else self.categories[i]
+
+    def neighbors(self, name, target, k=5, same_category=False):
+        """
+        (전체 위치 배열, 표준화 거리 배열): name과 가까운 순서로 target 값이
+        (1 - MIN_IMPROVEMENT)배 이하인 음식 최대 k개. 없는 이름이면 빈 배열.
+        """
+        i = self._name_id.get(name)
+        empty = np.empty(0, dtype=np.int64), np.empty(0)
+        if i is None:
+            return empty
+        scope = self.categories[i] if same_category else None
+        scores = self.scores[target]
+        if scores[i] <= 0:  # 이미 0이면 더 낮은 음식이 없음
+            return empty
+
+        # 조건에 맞는 음식 = 정렬된 값에서 limit 이하인 앞부분
+        sorted_scores, order = self._sorted[scope, target]
+        count = np.searchsorted(sorted_scores, scores[i] * (1 - MIN_IMPROVEMENT), side="right")
+        if count == 0:
+            return empty
+        if count <= BRUTE_FORCE_MAX:
+            candidates = order[:count]
+            dist = np.sqrt(((self.vectors[candidates] - self.vectors[i]) ** 2).sum(axis=1))
+            top = np.argpartition(dist, k - 1)[:k] if count > k else np.arange(count)
+            top = top[np.argsort(dist[top], kind="stable")]
+            return candidates[top], dist[top]
+
+        tree, ids = self._trees[scope]
+        limit = sorted_scores[count - 1]
+        fetch = min(len(ids), int(k * len(ids) / count * FETCH_FACTOR) + 1)
+        while True:
+            dist, pos = tree.query(self.vectors[i:i + 1], k=fetch)
+            found = ids[pos[0]]
+            keep = scores[found] <= limit
+            if keep.sum() >= k or fetch == len(ids):
+                return found[keep][:k], dist[0][keep][:k]
+            fetch = min(len(ids), fetch * 2)
+
+    def substitutes(self, name, target, k=5, same_category=False):
+        """
+        대안 음식 DataFrame (식품명, 거리, 영양값 100g 기준, 비교 지표).
+        거리가 작을수록 원래 음식과 영양 구성이 비슷합니다.
+        """
+        found, dist = self.neighbors(name, target, k, same_category)
+        column = TARGETS[target][0]
+        columns = FEATURE_COLUMNS if column in FEATURE_COLUMNS else FEATURE_COLUMNS + [column]
+        result = self._table.iloc[found][columns].reset_index()
+        result.insert(1, "거리", np.round(dist, 2))
+        return result
+
+
+def get_substitute_index():
+    """공유 음식 데이터 테이블의 대안 음식 인덱스."""
+    return get_derived("substitute_index", lambda df: SubstituteIndex(df, get_food_index(), get_food_metrics()))
@@ -0,0 +1,118 @@
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+import food_cache
+
+# ============================================================
+# 음식 영양 데이터(food1.csv) 공용 로더
+# ============================================================
+# Streamlit은 상호작용마다 스크립트를 다시 실행하므로, 페이지마다
+# pd.read_csv를 호출하면 매번 14,584행을 새로 파싱하게 됩니다.
+# 이 모듈은 프로세스당 한 번만 읽어 모든 세션이 같은 DataFrame을
+# 읽기 전용으로 공유하고, 파일이 바뀌었을 때만 다시 읽습니다.
+# 빌드된 바이너리 캐시(food1.cache, food_cache.py 참고)가 최신이면
+# CSV 대신 메모리 맵으로 불러옵니다.
+
+BASE_DIR = os.path.dirname(__file__)
+FOOD_CSV_PATH = os.path.join(BASE_DIR, "food1.csv")
+
+TEXT_COLUMNS = ["식품코드", "식품명", "영양성분함량기준량"]
+NUMERIC_COLUMNS = ["탄수화물(g)", "단백질(g)", "지방(g)", "당류(g)", "에너지(kcal)", "나트륨(mg)"]
+
+_lock = threading.Lock()
+_derived_lock = threading.RLock()  # 파생 구조 빌드가 다른 파생 구조를 참조할 수 있음
+_derived = {}  # key -> (원본 DataFrame, 파생 객체)
+_state = {
+    "path": None,       # 현재 로드된 파일 경로
+    "stat": None,       # (mtime_ns, size) — 변경 여부를 싸게 확인하는 용도
+    "digest": None,     # 파일 내용의 sha256
+    "df": None,         # 공유 DataFrame
+}
+
+
+def _file_stat(path):
+    st_ = os.stat(path)
+    return (st_.st_mtime_ns, st_.st_size)
+
+
+def file_digest(path):
+    """파일 내용의 sha256 해시를 반환합니다."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def coerce_food_table(df):
+    """문자열/숫자 컬럼의 타입을 정리합니다. (숫자 변환 실패 값은 0으로 채움)"""
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(str)
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype("float64")
+    return df
+
+
+def read_food_csv(path=FOOD_CSV_PATH):
+    """CSV를 읽고 타입을 정리한 새 DataFrame을 반환합니다. (캐시 없음)"""
+    return coerce_food_table(pd.read_csv(path))
+
+
+def get_food_table(path=FOOD_CSV_PATH):
+    """
+    공유 음식 데이터 테이블을 반환합니다.
+
+    반환된 DataFrame은 모든 세션이 함께 쓰므로 수정하면 안 됩니다.
+    값을 바꿔야 한다면 df.copy()를 사용하세요.
+    파일의 수정 시각/크기가 바뀌면 해시를 비교해 내용이 달라진 경우에만 다시 읽습니다.
+    파일이 없으면 FileNotFoundError가 발생합니다.
+    """
+    stat = _file_stat(path)
+    df = _state["df"]
+    if df is not None and _state["path"] == path and _state["stat"] == stat:
+        return df
+
+    with _lock:
+        # 다른 스레드가 먼저 갱신했을 수 있으므로 다시 확인
+        stat = _file_stat(path)
+        if _state["df"] is not None and _state["path"] == path and _state["stat"] == stat:
+            return _state["df"]
+
+        digest = file_digest(path)
+        if _state["df"] is not None and _state["path"] == path and _state["digest"] == digest:
+            # 내용은 그대로이고 mtime만 바뀐 경우 (touch, git checkout 등)
+            _state["stat"] = stat
+            return _state["df"]
+
+        # 캐시가 없거나 오래되었으면 CSV로 대체
+        df = food_cache.load_cache(food_cache.cache_path_for(path), digest)
+        if df is None:
+            df = read_food_csv(path)
+        _state.update(path=path, stat=stat, digest=digest, df=df)
+        return df
+
+
+def get_derived(key, build, path=FOOD_CSV_PATH):
+    """
+    테이블에서 만든 파생 구조(인덱스, 사전 계산 컬럼 등)를 공유 캐시에서 꺼냅니다.
+
+    build(df)는 테이블이 (다시) 로드된 뒤 처음 요청될 때 한 번만 호출되며,
+    결과는 테이블과 마찬가지로 모든 세션이 읽기 전용으로 공유합니다.
+    """
+    df = get_food_table(path)
+    cached = _derived.get((path, key))
+    if cached is not None and cached[0] is df:
+        return cached[1]
+
+    with _derived_lock:
+        cached = _derived.get((path, key))
+        if cached is not None and cached[0] is df:
+            return cached[1]
+        value = build(df)
+        _derived[(path, key)] = (df, value)
+        return value
@@ -0,0 +1,150 @@
+import functools
+import threading
+
+import numpy as np
+from PIL import Image
+
+# ============================================================
+# 이미지 지각 해시 (perceptual hash)
+# ============================================================
+# 재압축, 크기 변경 정도로는 값이 거의 바뀌지 않는 64비트 해시입니다.
+# dHash는 같은 사진을 다시 올렸는지 확인하는 캐시 키로,
+# pHash는 잘림/재압축/스크린샷처럼 거의 같은 사진을 찾는 HashIndex 검색에 사용합니다.
+
+
+def dhash(image, size=8):
+    """차이 해시(dHash): 가로로 이웃한 픽셀의 밝기 증감을 비트로 기록합니다."""
+    gray = image.convert("L").resize((size + 1, size), Image.Resampling.BILINEAR)
+    pixels = list(gray.getdata())
+    value = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for col in range(size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hash_hex(value, bits=64):
+    """해시 값을 고정 길이 16진수 문자열로 바꿉니다."""
+    return f"{value:0{bits // 4}x}"
+
+
+@functools.lru_cache(maxsize=4)
+def _dct_matrix(n):
+    """n×n DCT-II 행렬 (직교 정규화)."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m
+
+
+def phash(image, size=8, highfreq_factor=4):
+    """
+    지각 해시(pHash): 축소한 흑백 이미지의 2D DCT 저주파 성분이 중앙값보다 큰지 비트로 기록합니다.
+    dHash보다 재압축, 밝기 변화, 약간의 잘림에 강합니다.
+    """
+    n = size * highfreq_factor
+    gray = np.asarray(image.convert("L").resize((n, n), Image.Resampling.BILINEAR), dtype=np.float64)
+    d = _dct_matrix(n)
+    low = (d @ gray @ d.T)[:size, :size].ravel()
+    bits = low > np.median(low[1:])  # 직류 성분(평균 밝기)은 기준에서 제외
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+# ============================================================
+# 해밍 거리 검색 인덱스 (거의 같은 사진 찾기)
+# ============================================================
+# 64비트 해시를 np.uint64 배열에 모아 두고, XOR 결과를 16비트 단위로 나눠
+# 미리 계산한 비트 수 표(65,536칸)로 한 번에 해밍 거리를 구합니다.
+# 크기는 max_entries로 제한하며, 가득 차면 가장 오래 쓰이지 않은 항목을 덮어씁니다.
+
+_POPCOUNT16 = np.array([bin(i).count("1") for i in range(1 << 16)], dtype=np.uint8)
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_DISTANCE = 6  # 64비트 중 이 이하로 다르면 같은 사진으로 봄
+
+
+def hamming_distances(hashes, value):
+    """uint64 해시 배열과 해시 하나 사이의 해밍 거리 배열."""
+    x = np.bitwise_xor(hashes, np.uint64(value))
+    counts = _POPCOUNT16[x.view(np.uint16)].reshape(-1, 4)
+    # 열 4개를 직접 더하는 편이 sum(axis=1)보다 약 3배 빠름 (최대 64라 uint8로 충분)
+    return counts[:, 0] + counts[:, 1] + counts[:, 2] + counts[:, 3]
+
+
+class HashIndex:
+    """64비트 지각 해시 → 값 근사 검색 인덱스 (LRU 크기 제한, 스레드 안전)."""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_distance=DEFAULT_MAX_DISTANCE):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._hashes = np.zeros(max_entries, dtype=np.uint64)
+        self._scopes = np.zeros(max_entries, dtype=np.uint64)
+        self._ticks = np.zeros(max_entries, dtype=np.int64)  # 마지막 사용 시각 (LRU)
+        self._values = [None] * max_entries
+        self._slots = {}  # (해시, 범위) → 칸 번호
+        self._size = 0
+        self._tick = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def add(self, value_hash, value, scope=0):
+        """해시와 값을 저장합니다. scope가 다른 항목끼리는 검색되지 않습니다."""
+        slot_key = (value_hash, scope)
+        with self._lock:
+            self._tick += 1
+            slot = self._slots.get(slot_key)
+            if slot is None:
+                if self._size < self.max_entries:
+                    slot = self._size
+                    self._size += 1
+                else:
+                    slot = int(np.argmin(self._ticks))
+                    del self._slots[(int(self._hashes[slot]), int(self._scopes[slot]))]
+                self._slots[slot_key] = slot
+                self._hashes[slot] = value_hash
+                self._scopes[slot] = scope
+            self._values[slot] = value
+            self._ticks[slot] = self._tick
+
+    def lookup(self, value_hash, scope=0, max_distance=None):
+        """가장 가까운 항목의 (값, 거리)를 반환합니다. max_distance 안에 없으면 None."""
+        max_distance = self.max_distance if max_distance is None else max_distance
+        with self._lock:
+            n = self._size
+            if not n:
+                return None
+            distances = hamming_distances(self._hashes[:n], value_hash)
+            distances[self._scopes[:n] != np.uint64(scope)] = 255
+            slot = int(np.argmin(distances))
+            distance = int(distances[slot])
+            if distance > max_distance:
+                return None
+            self._tick += 1
+            self._ticks[slot] = self._tick
+            return self._values[slot], distance
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_hash_index(load=None):
+    """
+    프로세스 내에서 공유되는 사진 해시 인덱스.
+    처음 만들 때 load(max_entries)가 있으면 그 결과((해시, 값, 범위) 목록, 최근 사용 순)로
+    채웁니다. (재시작 전에 저장해 둔 해시 복원용)
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            index = HashIndex()
+            if load is not None:
+                # 오래된 항목부터 넣어 LRU 순서를 저장된 사용 순서와 맞춤
+                for value_hash, value, scope in reversed(load(index.max_entries)):
+                    index.add(value_hash, value, scope)
+            _index = index
+        return _index
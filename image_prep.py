@@ -0,0 +1,106 @@
+import io
+import time
+
+from PIL import Image, ImageOps
+
+# ============================================================
+# 업로드 이미지 전처리 (축소 + 재인코딩)
+# ============================================================
+# 휴대폰 사진(4~12MP, 수 MB)을 그대로 Gemini에 보내면 업로드 시간과 토큰 비용이
+# 커집니다. 모델에 보내기 전에
+#   1. JPEG은 draft()로 디코딩 단계에서부터 1/2, 1/4 ... 크기로 읽고
+#   2. EXIF 방향대로 회전한 뒤
+#   3. 긴 변이 max_side가 되도록 빠른 필터로 축소하고
+#   4. 메타데이터(EXIF, ICC 등) 없이 JPEG/WebP로 다시 인코딩합니다.
+#      (목표 용량을 넘으면 품질을 단계적으로 낮춤)
+
+MAX_SIDE = 1024
+TARGET_BYTES = 200_000
+QUALITIES = (85, 75, 65, 55, 45)
+FORMATS = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+ORIENTATION_TAG = 0x0112
+
+
+class PreparedImage:
+    """전처리된 이미지와 전/후 크기, 소요 시간."""
+
+    def __init__(self, image, data, mime_type, original_bytes, original_size, elapsed_ms):
+        self.image = image                  # 축소된 PIL 이미지 (화면 표시, 해시 계산용)
+        self.data = data                    # 재인코딩된 바이트
+        self.mime_type = mime_type
+        self.original_bytes = original_bytes
+        self.original_size = original_size  # (가로, 세로) 픽셀
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def size(self):
+        return self.image.size
+
+    def blob(self):
+        """generate_content에 바로 넘길 수 있는 인라인 데이터."""
+        return {"mime_type": self.mime_type, "data": self.data}
+
+    def summary(self):
+        """전/후 크기 요약 문자열."""
+        (w0, h0), (w1, h1) = self.original_size, self.size
+        return (f"{w0}×{h0} ({self.original_bytes / 1024:,.0f} KB) → "
+                f"{w1}×{h1} ({len(self.data) / 1024:,.0f} KB), {self.elapsed_ms:.0f} ms")
+
+
+def _read_bytes(source):
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if hasattr(source, "getvalue"):  # Streamlit UploadedFile, BytesIO
+        return source.getvalue()
+    with open(source, "rb") as f:
+        return f.read()
+
+
+def _to_rgb(image):
+    """투명 배경은 흰색으로 채워 RGB로 바꿉니다."""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB") if image.mode != "RGB" else image
+
+
+def _encode(image, fmt, target_bytes):
+    data = b""
+    for quality in QUALITIES:
+        buffer = io.BytesIO()
+        if fmt == "WEBP":
+            image.save(buffer, format="WEBP", quality=quality, method=4)
+        else:
+            image.save(buffer, format="JPEG", quality=quality, optimize=True)
+        data = buffer.getvalue()
+        if len(data) <= target_bytes:
+            break
+    return data
+
+
+def prepare_image(source, max_side=MAX_SIDE, fmt="JPEG", target_bytes=TARGET_BYTES):
+    """
+    업로드 파일(또는 bytes, 경로)을 축소/재인코딩해 PreparedImage로 반환합니다.
+    fmt는 "JPEG" 또는 "WEBP"입니다.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    start = time.perf_counter()
+    raw = _read_bytes(source)
+
+    image = Image.open(io.BytesIO(raw))
+    original_size = image.size
+    if image.getexif().get(ORIENTATION_TAG) in (5, 6, 7, 8):  # 90도 회전된 사진
+        original_size = original_size[::-1]
+    # JPEG은 디코딩 자체를 축소된 크기로 (정사각형 기준이라 회전과 무관)
+    image.draft("RGB", (max_side, max_side))
+    image = ImageOps.exif_transpose(image)
+    image = _to_rgb(image)
+    image.thumbnail((max_side, max_side), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    image.info.clear()  # EXIF/ICC 등 메타데이터 제거
+
+    data = _encode(image, fmt, target_bytes)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return PreparedImage(image, data, FORMATS[fmt], len(raw), original_size, elapsed_ms)
@@ -0,0 +1,305 @@
+import datetime
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+from response_cache import BASE_DIR
+
+# ============================================================
+# 섭취 기록 (SQLite) + 일/주/월 합계 테이블
+# ============================================================
+# 사용자가 먹은 음식(식품코드, 섭취량, 시각)을 새로고침해도 남도록 저장합니다.
+# - 기록할 때의 영양값(섭취량 기준)을 함께 저장하므로 음식 데이터가 바뀌어도 기록은 그대로입니다.
+# - daily_totals는 (사용자, 날짜)별 합계를 들고 있고, 기록 추가/삭제와 같은 트랜잭션에서
+#   더하기/빼기로 갱신합니다. 대시보드는 기록 전체를 다시 집계하지 않고 합계 행만 읽습니다.
+# - weekly_totals / monthly_totals도 같은 방식으로 갱신합니다 (일 → 주 → 월).
+#   days 컬럼은 기록이 있는 날 수로, 하루 합계 행이 생기거나 사라질 때만 바뀝니다.
+#   (주/월 평균 = 합계 / days)
+# - 날짜는 서버 현지 시각 기준 'YYYY-MM-DD', 주는 그 주 월요일 날짜, 월은 'YYYY-MM'입니다.
+# - user_id는 호출한 쪽이 준 문자열을 그대로 씁니다. 이 모듈은 권한을 확인하지 않으므로
+#   (app_pref는 주소의 ?user= 값) user_id를 아는 사람은 그 사용자의 기록을 읽고 지울 수 있습니다.
+
+LOG_PATH = os.path.join(BASE_DIR, ".cache", "intake.sqlite3")
+
+# 저장 컬럼 → 음식 데이터 컬럼
+NUTRIENT_COLUMNS = {
+    "kcal": "에너지(kcal)",
+    "carbs": "탄수화물(g)",
+    "protein": "단백질(g)",
+    "fat": "지방(g)",
+    "sugar": "당류(g)",
+    "sodium": "나트륨(mg)",
+}
+_FIELDS = list(NUTRIENT_COLUMNS)
+TOTAL_COLUMNS = ["period", "days", "entries"] + _FIELDS
+
+
+def day_of(timestamp):
+    """유닉스 시각 → 현지 날짜 문자열 'YYYY-MM-DD'."""
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+def week_of(day):
+    """날짜 문자열 → 그 주(월~일) 월요일 날짜 문자열."""
+    date = datetime.date.fromisoformat(day)
+    return (date - datetime.timedelta(days=date.weekday())).isoformat()
+
+
+def month_of(day):
+    """날짜 문자열 → 'YYYY-MM'."""
+    return day[:7]
+
+
+# 단위 → (합계 테이블, 날짜 → 기간 함수, 기존 기록에서 채울 때 쓰는 SQL 식)
+ROLLUPS = {
+    "week": ("weekly_totals", week_of, "date(day, 'weekday 0', '-6 days')"),
+    "month": ("monthly_totals", month_of, "substr(day, 1, 7)"),
+}
+
+
+class IntakeLog:
+    """사용자별 섭취 기록과 하루 합계."""
+
+    def __init__(self, path=LOG_PATH):
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        nutrients = ", ".join(f"{field} REAL NOT NULL" for field in _FIELDS)
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS intake (
+                id        INTEGER PRIMARY KEY,
+                user_id   TEXT NOT NULL,
+                food_code TEXT NOT NULL,
+                food_name TEXT NOT NULL,
+                amount    REAL NOT NULL,
+                eaten_at  REAL NOT NULL,
+                day       TEXT NOT NULL,
+                {nutrients}
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS intake_user_day ON intake (user_id, day)")
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS daily_totals (
+                user_id TEXT NOT NULL,
+                day     TEXT NOT NULL,
+                entries INTEGER NOT NULL,
+                {nutrients},
+                PRIMARY KEY (user_id, day)
+            )
+        """)
+        for table, _, period_sql in ROLLUPS.values():
+            exists = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    user_id TEXT NOT NULL,
+                    period  TEXT NOT NULL,
+                    days    INTEGER NOT NULL,
+                    entries INTEGER NOT NULL,
+                    {nutrients},
+                    PRIMARY KEY (user_id, period)
+                )
+            """)
+            if not exists:
+                # 합계 테이블이 없던 기록 파일: 하루 합계에서 한 번 채움
+                sums = ", ".join(f"SUM({field})" for field in _FIELDS)
+                self._conn.execute(f"""
+                    INSERT INTO {table} (user_id, period, days, entries, {", ".join(_FIELDS)})
+                    SELECT user_id, {period_sql}, COUNT(*), SUM(entries), {sums}
+                    FROM daily_totals GROUP BY user_id, {period_sql}
+                """)
+
+    def _apply(self, user_id, day, count, sums):
+        """
+        하루의 기록 count개와 그 영양값 합 sums를 일/주/월 합계에 더합니다. (삭제는 둘 다 음수)
+        트랜잭션 안에서 호출합니다.
+        """
+        fields = ", ".join(_FIELDS)
+        placeholders = ", ".join("?" for _ in _FIELDS)
+        updates = ", ".join(f"{field} = {field} + excluded.{field}" for field in _FIELDS)
+        values = [sums[field] for field in _FIELDS]
+
+        entries = self._conn.execute(f"""
+            INSERT INTO daily_totals (user_id, day, entries, {fields}) VALUES (?, ?, ?, {placeholders})
+            ON CONFLICT (user_id, day) DO UPDATE SET entries = entries + excluded.entries, {updates}
+            RETURNING entries
+        """, (user_id, day, count, *values)).fetchone()[0]
+        # 하루 합계 행이 새로 생겼거나(+1) 사라졌으면(-1) 주/월의 기록한 날 수도 바뀜
+        new_days = 1 if count > 0 and entries == count else (-1 if entries <= 0 else 0)
+        if entries <= 0:
+            self._conn.execute("DELETE FROM daily_totals WHERE user_id = ? AND day = ?", (user_id, day))
+
+        for table, period_of, _ in ROLLUPS.values():
+            period = period_of(day)
+            self._conn.execute(f"""
+                INSERT INTO {table} (user_id, period, days, entries, {fields}) VALUES (?, ?, ?, ?, {placeholders})
+                ON CONFLICT (user_id, period) DO UPDATE SET
+                    days = days + excluded.days, entries = entries + excluded.entries, {updates}
+            """, (user_id, period, new_days, count, *values))
+            if count < 0:
+                self._conn.execute(f"DELETE FROM {table} WHERE user_id = ? AND period = ? AND entries <= 0",
+                                   (user_id, period))
+
+    def add(self, user_id, food_code, food_name, amount, values, eaten_at=None):
+        """
+        기록 하나를 추가하고 id를 반환합니다.
+        values는 섭취량 기준 영양값 dict (NUTRIENT_COLUMNS의 키)입니다.
+        """
+        eaten_at = time.time() if eaten_at is None else eaten_at
+        day = day_of(eaten_at)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = self._conn.execute(f"""
+                    INSERT INTO intake (user_id, food_code, food_name, amount, eaten_at, day, {", ".join(_FIELDS)})
+                    VALUES (?, ?, ?, ?, ?, ?, {", ".join("?" for _ in _FIELDS)})
+                """, (user_id, food_code, food_name, amount, eaten_at, day, *(values[f] for f in _FIELDS)))
+                self._apply(user_id, day, 1, values)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.lastrowid
+
+    def add_many(self, user_id, entries):
+        """
+        여러 기록을 한 트랜잭션으로 추가합니다. (가져오기, 동기화용)
+        entries는 (food_code, food_name, amount, values, eaten_at) 튜플 목록이며,
+        합계는 날짜별로 모아 날짜마다 한 번씩 갱신합니다.
+        """
+        rows = []
+        per_day = defaultdict(lambda: [0, dict.fromkeys(_FIELDS, 0.0)])
+        for food_code, food_name, amount, values, eaten_at in entries:
+            day = day_of(eaten_at)
+            rows.append((user_id, food_code, food_name, amount, eaten_at, day, *(values[f] for f in _FIELDS)))
+            total = per_day[day]
+            total[0] += 1
+            for field in _FIELDS:
+                total[1][field] += values[field]
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(f"""
+                    INSERT INTO intake (user_id, food_code, food_name, amount, eaten_at, day, {", ".join(_FIELDS)})
+                    VALUES (?, ?, ?, ?, ?, ?, {", ".join("?" for _ in _FIELDS)})
+                """, rows)
+                for day, (count, sums) in per_day.items():
+                    self._apply(user_id, day, count, sums)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def remove(self, user_id, entry_id):
+        """사용자의 기록 하나를 지우고 합계에서 뺍니다. 지웠으면 True."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT day, {', '.join(_FIELDS)} FROM intake WHERE id = ? AND user_id = ?",
+                    (entry_id, user_id),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute("DELETE FROM intake WHERE id = ?", (entry_id,))
+                    self._apply(user_id, row[0], -1, {field: -value for field, value in zip(_FIELDS, row[1:])})
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return row is not None
+
+    def day_totals(self, user_id, day=None):
+        """하루 합계 dict (entries + 영양값). 기록이 없으면 모두 0. day 생략 시 오늘."""
+        day = day_of(time.time()) if day is None else day
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT entries, {', '.join(_FIELDS)} FROM daily_totals WHERE user_id = ? AND day = ?",
+                (user_id, day),
+            ).fetchone()
+        return dict(zip(["entries"] + _FIELDS, row if row is not None else [0] + [0.0] * len(_FIELDS)))
+
+    def totals(self, user_id, level="day", start=None, end=None):
+        """
+        단위(day/week/month)별 합계 DataFrame (period, days, entries, 영양값), 기간 순서.
+        start/end는 기간 값(날짜, 주 월요일 날짜, 'YYYY-MM')이며 양 끝을 포함합니다.
+        """
+        if level == "day":
+            table, period, days = "daily_totals", "day", "1"
+        else:
+            table, period, days = ROLLUPS[level][0], "period", "days"
+        query = f"SELECT {period}, {days}, entries, {', '.join(_FIELDS)} FROM {table} WHERE user_id = ?"
+        params = [user_id]
+        if start is not None:
+            query += f" AND {period} >= ?"
+            params.append(start)
+        if end is not None:
+            query += f" AND {period} <= ?"
+            params.append(end)
+        with self._lock:
+            rows = self._conn.execute(query + f" ORDER BY {period}", params).fetchall()
+        return pd.DataFrame(rows, columns=TOTAL_COLUMNS)
+
+    def rescan_totals(self, user_id, level="day"):
+        """
+        합계 테이블 대신 기록 원본을 다시 집계한 totals()와 같은 형태의 DataFrame.
+        기록 수에 비례해 느리므로 합계 테이블 검증과 벤치마크용입니다.
+        """
+        period = "day" if level == "day" else ROLLUPS[level][2]
+        with self._lock:
+            rows = self._conn.execute(f"""
+                SELECT {period} AS period, COUNT(DISTINCT day), COUNT(*), {", ".join(f"SUM({f})" for f in _FIELDS)}
+                FROM intake WHERE user_id = ? GROUP BY period ORDER BY period
+            """, (user_id,)).fetchall()
+        return pd.DataFrame(rows, columns=TOTAL_COLUMNS)
+
+    def history(self, user_id, start=None, end=None):
+        """기록 원본 DataFrame (day, eaten_at, 영양값), 시각 순서. start/end는 날짜이며 양 끝을 포함합니다."""
+        query = f"SELECT day, eaten_at, {', '.join(_FIELDS)} FROM intake WHERE user_id = ?"
+        params = [user_id]
+        if start is not None:
+            query += " AND day >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND day <= ?"
+            params.append(end)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY eaten_at, id", params).fetchall()
+        return pd.DataFrame(rows, columns=["day", "eaten_at"] + _FIELDS)
+
+    def entries(self, user_id, day=None):
+        """하루 기록 DataFrame (id, 식품 정보, 섭취량, 시각, 영양값). day 생략 시 오늘."""
+        day = day_of(time.time()) if day is None else day
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT id, food_code, food_name, amount, eaten_at, {', '.join(_FIELDS)}
+                    FROM intake WHERE user_id = ? AND day = ? ORDER BY eaten_at, id""",
+                (user_id, day),
+            ).fetchall()
+        return pd.DataFrame(rows, columns=["id", "food_code", "food_name", "amount", "eaten_at"] + _FIELDS)
+
+
+def food_values(row, amount):
+    """음식 데이터 행(식품코드 포함) → 섭취량 기준 영양값 dict (NUTRIENT_COLUMNS의 키)."""
+    return {field: float(row[column]) * amount / 100 for field, column in NUTRIENT_COLUMNS.items()}
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_intake_log(**kwargs):
+    """프로세스 내에서 공유되는 섭취 기록을 반환합니다."""
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = IntakeLog(**kwargs)
+        return _log
@@ -0,0 +1,272 @@
+import asyncio
+import concurrent.futures
+import os
+import queue
+import random
+import threading
+
+from response_cache import make_key
+
+# ============================================================
+# 비동기 LLM 클라이언트 (동시 실행 제한 / 타임아웃 / 재시도 / 요청 합치기)
+# ============================================================
+# Gemini SDK 호출은 동기식이라 Streamlit 스크립트 스레드를 수 초씩 붙잡습니다.
+# 모든 호출을 프로세스 공용 이벤트 루프(백그라운드 스레드)로 보내
+#   - 세마포어로 동시에 나가는 업스트림 요청 수를 제한하고
+#   - 호출마다 타임아웃을 걸고
+#   - 타임아웃 / 429(요청 한도 초과) / 5xx(서버 오류)이면 지터가 섞인 지수 백오프로 재시도하며
+#   - 같은 키의 요청이 진행 중이면 새로 호출하지 않고 그 결과를 함께 기다립니다.
+# stream()은 응답 조각을 도착하는 대로 넘겨줍니다. (재시도/합치기는 적용되지 않음)
+#
+# 타임아웃이 나도 실행 중인 스레드는 멈출 수 없으므로, 세마포어 자리는 실제 호출이
+# 끝날 때 반납합니다. (느린 호출이 쌓여 동시 실행 제한을 넘지 않도록)
+# Gemini 호출에는 같은 타임아웃을 SDK에도 넘겨(request_options) 스레드가 그 안에 끝나게 하고,
+# SDK 자체 재시도는 끄고 이 모듈의 재시도만 사용합니다.
+#
+# 페이지는 get_llm_client()로 공용 Gemini 클라이언트를 받습니다. 처음 호출될 때
+# API 키를 읽고 모델을 만들며, 모듈 import 시점에는 아무것도 하지 않습니다.
+# (google.generativeai도 이때 import)
+#
+# 오프라인 테스트:
+#   - set_llm_client(LLMClient(가짜_generate))로 가짜 클라이언트를 주입하거나
+#   - GEMINI_API_ENDPOINT (예: http://127.0.0.1:8080)를 설정하면 configure_gemini()가
+#     REST 전송으로 해당 주소에 요청을 보냅니다.
+
+GEMINI_MODEL = "gemini-2.5-flash"
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 60.0  # 초
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF = 0.5   # 초 (첫 재시도 기준, 시도마다 2배)
+MAX_BACKOFF = 8.0
+
+_loop = None
+_loop_lock = threading.Lock()
+_DONE = object()  # 스트림 종료 표시
+
+
+def _get_loop():
+    """프로세스 공용 이벤트 루프 (데몬 스레드에서 실행)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-client-loop", daemon=True).start()
+        return _loop
+
+
+def configure_gemini(api_key):
+    """Gemini SDK를 설정합니다. GEMINI_API_ENDPOINT가 있으면 그 주소로 REST 요청을 보냅니다."""
+    import google.generativeai as genai
+
+    endpoint = os.environ.get("GEMINI_API_ENDPOINT")
+    if endpoint:
+        genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": endpoint})
+    else:
+        genai.configure(api_key=api_key)
+
+
+def _request_options(timeout):
+    """SDK 호출 옵션: HTTP 타임아웃(초)을 걸고 SDK 자체 재시도는 끕니다."""
+    return {"timeout": timeout, "retry": None}
+
+
+def gemini_generate(model, timeout=DEFAULT_TIMEOUT):
+    """GenerativeModel을 LLMClient용 호출 함수(contents → 응답 텍스트)로 감쌉니다."""
+    def generate(contents, **kwargs):
+        kwargs.setdefault("request_options", _request_options(timeout))
+        return model.generate_content(contents, **kwargs).text
+    return generate
+
+
+def gemini_stream(model, timeout=DEFAULT_TIMEOUT):
+    """GenerativeModel을 LLMClient용 스트리밍 함수(contents → 텍스트 조각 iterator)로 감쌉니다."""
+    def stream(contents, **kwargs):
+        kwargs.setdefault("request_options", _request_options(timeout))
+        for chunk in model.generate_content(contents, stream=True, **kwargs):
+            try:
+                text = chunk.text
+            except ValueError:  # 텍스트가 없는 조각 (안전 필터 등)
+                continue
+            if text:
+                yield text
+    return stream
+
+
+def gemini_client(model, **kwargs):
+    """GenerativeModel로 일반/스트리밍 호출을 모두 지원하는 LLMClient를 만듭니다."""
+    timeout = kwargs.get("timeout", DEFAULT_TIMEOUT)
+    return LLMClient(gemini_generate(model, timeout), stream=gemini_stream(model, timeout), **kwargs)
+
+
+def gemini_api_key():
+    """GEMINI_API_KEY 환경 변수, 없으면 st.secrets에서 API 키를 읽습니다. 없으면 RuntimeError."""
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if api_key:
+        return api_key
+    import streamlit as st
+
+    try:
+        return st.secrets["GEMINI_API_KEY"]
+    except (KeyError, FileNotFoundError) as e:
+        raise RuntimeError("GEMINI_API_KEY가 없습니다. secrets.toml에 GEMINI_API_KEY를 추가하세요.") from e
+
+
+def default_gemini_client():
+    """API 키로 SDK를 설정하고 GEMINI_MODEL의 LLMClient를 만듭니다."""
+    import google.generativeai as genai
+
+    configure_gemini(gemini_api_key())
+    return gemini_client(genai.GenerativeModel(GEMINI_MODEL))
+
+
+def is_retryable(error):
+    """재시도할 오류인지: 타임아웃, 429(요청 한도 초과), 5xx(서버 오류)만 재시도합니다."""
+    if isinstance(error, TimeoutError):
+        return True
+    from google.api_core import exceptions
+
+    return isinstance(error, (exceptions.TooManyRequests, exceptions.ResourceExhausted,
+                              exceptions.ServerError))
+
+
+class LLMClient:
+    """동기 생성 함수(generate)를 공용 이벤트 루프에서 제한된 동시성으로 실행합니다."""
+
+    def __init__(self, generate, stream=None, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF):
+        self._generate = generate
+        self._stream = stream
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="llm-call"
+        )
+        self._inflight = {}  # 키 → 진행 중인 Task (이벤트 루프 스레드에서만 접근)
+
+    async def _call_once(self, contents, kwargs):
+        loop = asyncio.get_running_loop()
+        await self._semaphore.acquire()
+        try:
+            call = loop.run_in_executor(self._executor, lambda: self._generate(contents, **kwargs))
+        except BaseException:
+            self._semaphore.release()
+            raise
+        # 타임아웃으로 먼저 돌아가더라도 자리는 스레드가 실제로 끝날 때 반납
+        call.add_done_callback(lambda _: self._semaphore.release())
+        return await asyncio.wait_for(asyncio.shield(call), self.timeout)
+
+    async def _call_with_retry(self, contents, kwargs):
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._call_once(contents, kwargs)
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = min(MAX_BACKOFF, self.backoff * 2 ** attempt)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+    async def agenerate(self, contents, key=None, **kwargs):
+        """
+        응답 텍스트를 반환하는 코루틴.
+
+        key가 같은 요청이 이미 진행 중이면 업스트림을 다시 호출하지 않고 그 결과를 공유합니다.
+        key를 생략하면 contents가 문자열(또는 문자열 목록)일 때 내용으로 키를 만듭니다.
+        """
+        if key is None and _is_text(contents):
+            key = make_key(contents, kwargs)
+        if key is None:
+            return await self._call_with_retry(contents, kwargs)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._call_with_retry(contents, kwargs))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 한 대기자가 취소돼도 공유 작업은 계속 진행
+        return await asyncio.shield(task)
+
+    def submit(self, contents, key=None, **kwargs):
+        """요청을 공용 루프에 제출하고 concurrent.futures.Future를 반환합니다."""
+        return asyncio.run_coroutine_threadsafe(self.agenerate(contents, key, **kwargs), _get_loop())
+
+    def generate(self, contents, key=None, **kwargs):
+        """동기 호출용 래퍼 (Streamlit 스크립트에서 사용)."""
+        return self.submit(contents, key, **kwargs).result()
+
+    async def _pump_stream(self, contents, kwargs, out):
+        loop = asyncio.get_running_loop()
+        await self._semaphore.acquire()
+        step = None
+        try:
+            step = loop.run_in_executor(self._executor, lambda: iter(self._stream(contents, **kwargs)))
+            chunks = await asyncio.wait_for(asyncio.shield(step), self.timeout)
+            while True:
+                # 조각 사이 간격에 타임아웃 적용
+                step = loop.run_in_executor(self._executor, next, chunks, _DONE)
+                chunk = await asyncio.wait_for(asyncio.shield(step), self.timeout)
+                if chunk is _DONE:
+                    return
+                out.put(chunk)
+        finally:
+            # 타임아웃이면 아직 실행 중인 조각 호출이 끝날 때 자리 반납
+            if step is None or step.done():
+                self._semaphore.release()
+            else:
+                step.add_done_callback(lambda _: self._semaphore.release())
+
+    def stream(self, contents, **kwargs):
+        """
+        응답 텍스트 조각을 도착하는 대로 내보내는 동기 제너레이터.
+        업스트림 호출은 generate()와 같은 동시 실행 제한을 받습니다.
+        """
+        if self._stream is None:
+            yield self.generate(contents, **kwargs)
+            return
+
+        out = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._pump_stream(contents, kwargs, out), _get_loop())
+        future.add_done_callback(lambda _: out.put(_DONE))
+        while True:
+            chunk = out.get()
+            if chunk is _DONE:
+                break
+            yield chunk
+        future.result()  # 스트림 중 발생한 예외를 호출한 쪽으로 전달
+
+
+def _is_text(contents):
+    if isinstance(contents, str):
+        return True
+    return isinstance(contents, (list, tuple)) and all(isinstance(c, str) for c in contents)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(name, factory):
+    """
+    프로세스 내에서 공유되는 이름별 LLMClient를 반환합니다.
+    처음 요청될 때 factory()로 만듭니다. (factory가 실패하면 다음 호출에서 다시 시도)
+    """
+    with _clients_lock:
+        if name not in _clients:
+            _clients[name] = factory()
+        return _clients[name]
+
+
+def get_llm_client():
+    """페이지 공용 Gemini 클라이언트. 처음 호출될 때 만들며, 키가 없으면 RuntimeError."""
+    return get_client("gemini", default_gemini_client)
+
+
+def set_llm_client(client, name="gemini"):
+    """공유 클라이언트를 교체합니다. (테스트용 가짜 클라이언트 주입, None이면 초기화)"""
+    with _clients_lock:
+        if client is None:
+            _clients.pop(name, None)
+        else:
+            _clients[name] = client
@@ -0,0 +1,204 @@
+import numpy as np
+import pandas as pd
+
+from food_ai.core import DAILY_LIMITS
+from food_index import get_food_index
+from food_metrics import get_food_metrics
+from food_search import normalize
+from food_table import get_derived
+
+# ============================================================
+# 로컬 식단 플래너 (food1.csv 기반, LLM 없이)
+# ============================================================
+# 하루 목표 열량과 3대 영양소 비율(BMI 상태별)에 맞춰 아침/점심/저녁에 음식 3개씩,
+# 음식마다 섭취량(50~300g)을 고릅니다.
+#
+#   1. 탐욕 단계: 빈 칸을 하나씩 채우며, 후보 전체 × 섭취량 전체의 손실을
+#      (후보 수, 섭취량 수) 배열 한 번으로 계산해 가장 작은 것을 고릅니다.
+#   2. 지역 탐색: 칸 하나씩 나머지를 고정한 채 더 나은 음식/섭취량으로 바꾸고,
+#      더 이상 좋아지지 않으면 멈춥니다.
+#
+# 손실 = 끼니별 (열량, 탄수화물, 단백질, 지방) 목표 대비 상대 오차² 합
+#        + 하루 나트륨/당류 권장량 초과분² - 선호 음식 보너스
+# 후보는 가정식 분류(식품코드 D1, D3~D7)이면서 영양값이 일관된 음식입니다.
+# (D2는 프랜차이즈 피자/음료/디저트 위주라 식사 구성에서 제외)
+# 같은 음식 종류('_' 앞 이름)는 하루에 한 번만 사용합니다.
+# 피할 음식/중복 제외로 넣을 후보가 하나도 없는 칸은 비워 둡니다. (결과 행이 9개보다 적음)
+
+MEALS = {"아침": 0.3, "점심": 0.4, "저녁": 0.3}  # 끼니별 열량 비중
+ITEMS_PER_MEAL = 3
+PORTIONS = np.array([50, 100, 150, 200, 250, 300], dtype=np.float64)  # g/ml
+MEAL_CODE_PREFIXES = ("D1", "D3", "D4", "D5", "D6", "D7")
+
+PLAN_COLUMNS = ["에너지(kcal)", "탄수화물(g)", "단백질(g)", "지방(g)", "나트륨(mg)", "당류(g)"]
+TARGET_COLUMNS = PLAN_COLUMNS[:4]
+TARGET_WEIGHTS = np.array([2.0, 1.0, 1.0, 1.0])  # 열량 오차를 더 무겁게
+LIMIT_WEIGHT = 2.0
+PREF_BONUS = 0.05
+MAX_ROUNDS = 4
+
+# BMI 상태별 표준체중 1kg당 열량(kcal)과 탄수화물/단백질/지방 에너지 비율(%)
+KCAL_PER_KG = {"저체중": 35, "정상": 30, "과체중": 27, "비만": 25}
+MACRO_SPLITS = {
+    "저체중": (60, 15, 25),
+    "정상": (55, 20, 25),
+    "과체중": (50, 25, 25),
+    "비만": (45, 30, 25),
+}
+
+
+def daily_targets(height_cm, status, criteria):
+    """
+    하루 목표 (에너지, 탄수화물, 단백질, 지방).
+    표준체중 = 나이별 정상 BMI 범위 중간값 × 키(m)², 열량 = 표준체중 × 상태별 kcal/kg.
+    """
+    bmi_mid = (criteria["normal_min"] + criteria["normal_max"]) / 2
+    standard_weight = bmi_mid * (height_cm / 100) ** 2
+    kcal = standard_weight * KCAL_PER_KG.get(status, 30)
+    carb, protein, fat = MACRO_SPLITS.get(status, MACRO_SPLITS["정상"])
+    return {
+        "에너지(kcal)": kcal,
+        "탄수화물(g)": kcal * carb / 100 / 4,
+        "단백질(g)": kcal * protein / 100 / 4,
+        "지방(g)": kcal * fat / 100 / 9,
+    }
+
+
+def _matches(keys, terms):
+    """정규화한 식품명 배열 중 terms 중 하나라도 포함하는 위치 (불리언 배열)."""
+    mask = np.zeros(len(keys), dtype=bool)
+    for term in {normalize(t) for t in terms if t and t.strip()}:
+        if term:
+            mask |= np.fromiter((term in key for key in keys), dtype=bool, count=len(keys))
+    return mask
+
+
+class MealPlanner:
+    """가정식 후보 음식의 영양 행렬과 탐욕 + 지역 탐색 식단 생성기."""
+
+    def __init__(self, df, index, metrics):
+        first_rows = np.fromiter((rows[0] for rows in index.name_rows.values()), dtype=np.int64)
+        codes = df["식품코드"].to_numpy()[first_rows]
+        table = metrics.table
+
+        energy = table["에너지(kcal)"].to_numpy()
+        macro_kcal = table["탄수화물(g)"].to_numpy() * 4 + table["단백질(g)"].to_numpy() * 4 + \
+            table["지방(g)"].to_numpy() * 9
+        consistent = (energy >= 20) & (np.abs(macro_kcal / np.maximum(energy, 1) - 1) < 0.3)
+        meal_like = np.array([code.startswith(MEAL_CODE_PREFIXES) for code in codes])
+        keep = consistent & meal_like
+
+        self.names = table.index.to_numpy()[keep]
+        self.keys = [normalize(name) for name in self.names]
+        groups = pd.Series([name.split("_", 1)[0] for name in self.names])
+        self.groups = groups.factorize()[0]
+        # (후보, 섭취량, 영양소) 배열: 각 후보를 각 섭취량만큼 먹었을 때의 영양값
+        self.per_100g = table[PLAN_COLUMNS].to_numpy()[keep]
+        self.options = self.per_100g[:, None, :] * (PORTIONS / 100)[None, :, None]
+
+    def __len__(self):
+        return len(self.names)
+
+    def _meal_loss(self, totals, target):
+        """끼니 합계 (..., 6) → 목표 대비 가중 상대 오차² 합 (...)."""
+        rel = (totals[..., :4] - target) / target
+        return (rel ** 2) @ TARGET_WEIGHTS
+
+    def _limit_loss(self, day):
+        """하루 합계 (..., 6) → 나트륨/당류 권장량 초과분 벌점 (...)."""
+        over_na = np.maximum(day[..., 4] / DAILY_LIMITS["나트륨(mg)"] - 1, 0)
+        over_su = np.maximum(day[..., 5] / DAILY_LIMITS["당류(g)"] - 1, 0)
+        return LIMIT_WEIGHT * (over_na ** 2 + over_su ** 2)
+
+    def _best(self, meal_rest, day_rest, target, bonus, blocked):
+        """나머지를 고정하고 칸 하나에 넣을 (후보, 섭취량 위치, 손실). 넣을 후보가 없으면 None."""
+        meal = meal_rest + self.options
+        day = day_rest + self.options
+        loss = self._meal_loss(meal, target) + self._limit_loss(day) - bonus[:, None]
+        loss[blocked] = np.inf
+        i, p = np.unravel_index(np.argmin(loss), loss.shape)
+        if np.isinf(loss[i, p]):  # 모든 후보가 제외됨 (argmin이 0번 후보를 돌려주지 않도록)
+            return None
+        return i, p, loss[i, p]
+
+    def plan(self, targets, avoid=(), prefer=(), seed=None):
+        """
+        하루 식단 DataFrame (끼니, 식품명, 섭취량(g), 영양값...)을 반환합니다.
+        targets는 daily_targets() 결과, avoid/prefer는 식품명에 포함될 단어 목록입니다.
+        넣을 후보가 없는 칸은 빠지므로, 모든 후보가 제외되면 빈 DataFrame입니다.
+        seed를 주면 후보 점수에 작은 무작위 값을 더해 다른 조합을 만듭니다.
+        """
+        day_target = np.array([targets[c] for c in TARGET_COLUMNS], dtype=np.float64)
+        meal_targets = [day_target * share for share in MEALS.values()]
+        excluded = _matches(self.keys, avoid)
+        bonus = np.where(_matches(self.keys, prefer), PREF_BONUS, 0.0)
+        if seed is not None:
+            bonus = bonus + np.random.default_rng(seed).uniform(0, PREF_BONUS / 2, len(self))
+
+        n_meals = len(MEALS)
+        picks = np.full((n_meals, ITEMS_PER_MEAL), -1, dtype=np.int64)
+        portions = np.zeros((n_meals, ITEMS_PER_MEAL), dtype=np.int64)
+        values = np.zeros((n_meals, ITEMS_PER_MEAL, len(PLAN_COLUMNS)))
+
+        def blocked_for(m, s):
+            used = picks[picks >= 0]
+            used = used[used != picks[m, s]]
+            return excluded | np.isin(self.groups, self.groups[used])
+
+        # 1. 탐욕: 칸을 채울 때마다 끼니 목표를 채운 칸 비율만큼 나눠 적용
+        for m in range(n_meals):
+            for s in range(ITEMS_PER_MEAL):
+                partial = meal_targets[m] * (s + 1) / ITEMS_PER_MEAL
+                best = self._best(values[m].sum(axis=0), values.sum(axis=(0, 1)), partial,
+                                  bonus, blocked_for(m, s))
+                if best is None:
+                    continue  # 빈 칸 (picks = -1, 영양값 0)
+                i, p, _ = best
+                picks[m, s], portions[m, s] = i, p
+                values[m, s] = self.options[i, p]
+
+        # 2. 지역 탐색: 칸 하나씩 더 나은 음식/섭취량으로 교체
+        for _ in range(MAX_ROUNDS):
+            improved = False
+            for m in range(n_meals):
+                for s in range(ITEMS_PER_MEAL):
+                    meal_rest = values[m].sum(axis=0) - values[m, s]
+                    day_rest = values.sum(axis=(0, 1)) - values[m, s]
+                    kept_bonus = bonus[picks[m, s]] if picks[m, s] >= 0 else 0.0  # 빈 칸이면 보너스 없음
+                    current = self._meal_loss(values[m].sum(axis=0), meal_targets[m]) + \
+                        self._limit_loss(values.sum(axis=(0, 1))) - kept_bonus
+                    best = self._best(meal_rest, day_rest, meal_targets[m], bonus, blocked_for(m, s))
+                    if best is None:
+                        continue
+                    i, p, loss = best
+                    if loss < current - 1e-9:
+                        picks[m, s], portions[m, s] = i, p
+                        values[m, s] = self.options[i, p]
+                        improved = True
+            if not improved:
+                break
+
+        rows = []
+        for m, meal in enumerate(MEALS):
+            for s in range(ITEMS_PER_MEAL):
+                if picks[m, s] < 0:
+                    continue
+                rows.append({
+                    "끼니": meal,
+                    "식품명": self.names[picks[m, s]],
+                    "섭취량(g)": int(PORTIONS[portions[m, s]]),
+                    **dict(zip(PLAN_COLUMNS, np.round(values[m, s], 1).tolist())),
+                })
+        return pd.DataFrame(rows, columns=["끼니", "식품명", "섭취량(g)"] + PLAN_COLUMNS)
+
+
+def plan_totals(plan):
+    """식단의 끼니별 + 하루 합계 영양값."""
+    totals = plan.groupby("끼니", sort=False)[PLAN_COLUMNS].sum()
+    totals.loc["하루 합계"] = totals.sum()
+    return totals
+
+
+def get_meal_planner():
+    """공유 음식 데이터 테이블의 식단 플래너."""
+    return get_derived("meal_planner", lambda df: MealPlanner(df, get_food_index(), get_food_metrics()))
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.ensemble import GradientBoostingRegressor
+
+from calorie_estimator import FEATURES, TARGET, feature_matrix
+from food_table import FOOD_CSV_PATH, file_digest, get_food_table
+
+# ============================================================
+# 칼로리 보정 모델 레지스트리
+# ============================================================
+# 회귀 모델을 프로세스당 한 번만 불러와 모든 세션이 공유합니다.
+# - 분석기 페이지를 처음 열 때 warm_up()이 백그라운드에서 모델을 불러옵니다.
+# - 모델 파일은 매니페스트(food_calorie_model.json)의 모델 버전, sha256,
+#   scikit-learn 버전, 입력 피처 목록, 학습 데이터(food1.csv) sha256과 일치해야 사용합니다.
+# - 검증에 실패하면 사용자 요청 경로가 아닌 백그라운드 스레드에서 다시 학습하고,
+#   그동안 get_regressor()는 None을 반환합니다. (페이지는 보정 없이 동작)
+# - 로드/재학습이 실패하면 RETRY_BACKOFF초 뒤(실패할 때마다 2배, 최대 MAX_RETRY_BACKOFF초)
+#   다음 get_regressor() 호출에서 다시 시도합니다.
+#
+# 교차 검증 리포트와 함께 학습:  python train_calorie_model.py
+# 검증 후 필요할 때만 재학습:  python model_registry.py
+
+BASE_DIR = os.path.dirname(__file__)
+MODEL_PATH = os.path.join(BASE_DIR, "food_calorie_model.pkl")
+MANIFEST_PATH = os.path.join(BASE_DIR, "food_calorie_model.json")
+
+MODEL_VERSION = "2"  # 학습 데이터/피처가 바뀌면 올림 → 이전 모델은 자동 재학습
+RETRY_BACKOFF = 30.0       # 초 (실패 후 첫 재시도까지, 실패할 때마다 2배)
+MAX_RETRY_BACKOFF = 600.0
+
+_lock = threading.Lock()
+_state = {
+    "model": None,
+    "status": "idle",   # idle → loading → ready / rebuilding → ready / failed (→ 대기 후 loading)
+    "error": None,
+    "failures": 0,      # 연속 실패 횟수
+    "retry_at": 0.0,    # failed 상태에서 다시 시도할 수 있는 시각 (time.monotonic)
+}
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def verify(model_path=MODEL_PATH, manifest_path=MANIFEST_PATH, data_path=FOOD_CSV_PATH):
+    """모델 파일이 매니페스트와 일치하는지 확인합니다. 문제가 있으면 이유(str), 없으면 None."""
+    manifest = read_manifest(manifest_path)
+    if manifest is None:
+        return "매니페스트 없음"
+    if manifest.get("version") != MODEL_VERSION:
+        return f"모델 버전 불일치 ({manifest.get('version')} != {MODEL_VERSION})"
+    if not os.path.exists(model_path):
+        return "모델 파일 없음"
+    if manifest.get("sha256") != _sha256(model_path):
+        return "모델 파일 해시 불일치"
+    if manifest.get("sklearn_version") != sklearn.__version__:
+        return f"scikit-learn 버전 불일치 ({manifest.get('sklearn_version')} != {sklearn.__version__})"
+    if manifest.get("features") != FEATURES:
+        return "입력 피처 불일치"
+    if manifest.get("data_sha256") != file_digest(data_path):
+        return "학습 데이터(food1.csv) 해시 불일치"
+    return None
+
+
+def make_model():
+    return GradientBoostingRegressor(random_state=42)
+
+
+def train_model(df=None):
+    """
+    food1.csv 전체로 회귀 모델을 학습합니다. (모델, 매니페스트 추가 정보)를 반환합니다.
+    df를 생략하면 공유 테이블을 쓰고, 추가 정보에 food1.csv 해시(data_sha256)도 넣습니다.
+    """
+    extra = {}
+    if df is None:
+        extra["data_sha256"] = file_digest(FOOD_CSV_PATH)  # 학습 전에 계산 (학습 중 파일이 바뀌면 다음 검증에서 재학습)
+        df = get_food_table()
+    X = feature_matrix(df)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    model = make_model()
+    model.fit(X, y)
+    extra["training_rows"] = len(df)
+    return model, extra
+
+
+def save_model(model, extra=None, model_path=MODEL_PATH, manifest_path=MANIFEST_PATH):
+    """모델과 매니페스트를 임시 파일에 쓴 뒤 교체합니다."""
+    tmp_path = model_path + ".tmp"
+    joblib.dump(model, tmp_path)
+    manifest = {
+        "version": MODEL_VERSION,
+        "sha256": _sha256(tmp_path),
+        "sklearn_version": sklearn.__version__,
+        "features": FEATURES,
+        "target": TARGET,
+        **(extra or {}),
+    }
+    os.replace(tmp_path, model_path)
+    tmp_manifest = manifest_path + ".tmp"
+    with open(tmp_manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_manifest, manifest_path)
+    return manifest
+
+
+def rebuild():
+    """모델을 다시 학습해 저장하고 반환합니다."""
+    model, extra = train_model()
+    save_model(model, extra)
+    return model
+
+
+def _load_or_rebuild():
+    try:
+        problem = verify()
+        if problem is None:
+            try:
+                model = joblib.load(MODEL_PATH)
+            except Exception as e:  # 버전 차이 등으로 역직렬화 실패
+                problem = f"모델 로드 실패: {e}"
+        if problem is not None:
+            _state.update(status="rebuilding", error=problem)
+            model = rebuild()
+        _state.update(model=model, status="ready", error=None, failures=0)
+    except Exception as e:
+        failures = _state["failures"] + 1
+        delay = min(MAX_RETRY_BACKOFF, RETRY_BACKOFF * 2 ** (failures - 1))
+        _state.update(status="failed", error=str(e), failures=failures, retry_at=time.monotonic() + delay)
+
+
+def warm_up():
+    """
+    백그라운드에서 모델 로드(필요하면 재학습)를 시작합니다. 프로세스당 한 번만 실행되며,
+    실패했으면 백오프 시간이 지난 뒤 호출될 때 다시 시도합니다.
+    """
+    with _lock:
+        if _state["status"] == "failed":
+            if time.monotonic() < _state["retry_at"]:
+                return
+        elif _state["status"] != "idle":
+            return
+        _state["status"] = "loading"
+    threading.Thread(target=_load_or_rebuild, name="model-warm-up", daemon=True).start()
+
+
+def get_regressor():
+    """공유 회귀 모델을 반환합니다. 아직 준비되지 않았으면 None (요청 경로에서 기다리지 않음)."""
+    if _state["model"] is None:
+        warm_up()
+    return _state["model"]
+
+
+def status():
+    """현재 상태 ("idle", "loading", "rebuilding", "ready", "failed")와 마지막 문제 설명."""
+    return _state["status"], _state["error"]
+
+
+if __name__ == "__main__":
+    problem = verify()
+    print(f"현재 모델: {problem or '정상'}")
+    if problem or "--force" in sys.argv:
+        rebuild()
+        print(f"✅ 모델 재학습 및 저장 완료: {MODEL_PATH}")
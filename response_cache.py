@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# ============================================================
+# Gemini 응답 영구 캐시 (SQLite)
+# ============================================================
+# 같은 입력으로 버튼을 다시 누를 때마다 API를 호출하지 않도록 응답을 저장합니다.
+# - TTL이 지난 항목은 조회 시 삭제되고 캐시 미스로 처리됩니다.
+# - 네임스페이스별 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다.
+# - 프로세스 단위로 적중/미스 횟수를 집계합니다.
+# - 응답마다 64비트 근사 해시(예: 사진 pHash)와 검색 범위를 함께 저장할 수 있어,
+#   재시작 후에도 near_hashes()로 거의 같은 입력 검색 인덱스를 다시 채울 수 있습니다.
+
+BASE_DIR = os.path.dirname(__file__)
+CACHE_PATH = os.path.join(BASE_DIR, ".cache", "responses.sqlite3")
+
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_TTL = 7 * 24 * 3600  # 7일
+
+
+def make_key(*parts):
+    """키 구성 요소(JSON 직렬화 가능)를 sha256 문자열로 만듭니다."""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """네임스페이스 하나에 대한 SQLite 응답 캐시."""
+
+    def __init__(self, namespace, path=CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                namespace   TEXT NOT NULL,
+                key         TEXT NOT NULL,
+                value       TEXT NOT NULL,
+                created_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_lru ON responses (namespace, accessed_at)"
+        )
+        # 해시/범위는 부호 없는 64비트라 16진수 문자열로 저장
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS response_hashes (
+                namespace   TEXT NOT NULL,
+                key         TEXT NOT NULL,
+                hash        TEXT NOT NULL,
+                scope       TEXT NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+
+    def get(self, key):
+        """저장된 응답을 반환합니다. 없거나 만료되었으면 None."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE namespace = ? AND key = ?", (self.namespace, key)
+                )
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, value, near_hash=None, scope=0):
+        """
+        응답을 저장하고, 최대 개수를 넘으면 오래 사용하지 않은 항목을 지웁니다.
+        near_hash(64비트 정수)를 주면 scope와 함께 저장해 near_hashes()로 돌려줍니다.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, value, now, now),
+                )
+                if near_hash is not None:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO response_hashes VALUES (?, ?, ?, ?)",
+                        (self.namespace, key, f"{near_hash:016x}", f"{scope:016x}"),
+                    )
+                self._conn.execute("""
+                    DELETE FROM responses WHERE namespace = ? AND key IN (
+                        SELECT key FROM responses WHERE namespace = ?
+                        ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.namespace, self.namespace, self.max_entries))
+                self._conn.execute("""
+                    DELETE FROM response_hashes WHERE namespace = ? AND key NOT IN (
+                        SELECT key FROM responses WHERE namespace = ?
+                    )
+                """, (self.namespace, self.namespace))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def near_hashes(self, limit=None):
+        """
+        근사 해시가 저장된 유효한 응답의 (해시, 키, 범위) 목록. 최근에 사용한 순서이며
+        limit개까지 돌려줍니다. (만료된 항목 제외)
+        """
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT h.hash, h.key, h.scope FROM response_hashes h
+                JOIN responses r ON r.namespace = h.namespace AND r.key = h.key
+                WHERE h.namespace = ? AND r.created_at >= ?
+                ORDER BY r.accessed_at DESC LIMIT ?
+            """, (self.namespace, time.time() - self.ttl, -1 if limit is None else limit)).fetchall()
+        return [(int(value_hash, 16), key, int(scope, 16)) for value_hash, key, scope in rows]
+
+    def stats(self):
+        """적중/미스 횟수와 현재 저장된 항목 수."""
+        with self._lock:
+            size = self._conn.execute(
+                "SELECT COUNT(*) FROM responses WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": size,
+        }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace, **kwargs):
+    """프로세스 내에서 공유되는 네임스페이스별 캐시를 반환합니다."""
+    with _caches_lock:
+        if namespace not in _caches:
+            _caches[namespace] = ResponseCache(namespace, **kwargs)
+        return _caches[namespace]
@@ -0,0 +1,42 @@
+"""
+app_pref 페이지 테스트: Streamlit AppTest로 음식을 골라 오늘 기록에 추가합니다.
+
+실행:  python -m pytest tests/test_app_pref.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import intake_log
+
+
+def _page():
+    from app_pref import run_pref
+
+    run_pref()
+
+
+@pytest.fixture
+def log(tmp_path, monkeypatch):
+    log = intake_log.IntakeLog(str(tmp_path / "intake.sqlite3"))
+    monkeypatch.setattr(intake_log, "_log", log)
+    return log
+
+
+def test_log_foods_clears_selection_without_warnings(log):
+    at = AppTest.from_function(_page, default_timeout=120).run()
+    at.text_input(key="food_query").input("김치찌개").run()
+    select = at.multiselect(key="multi_food")
+    select.select(select.options[0]).run()
+
+    button = next(b for b in at.button if "오늘 기록에 추가" in b.label)
+    button.click().run()
+
+    assert not at.exception
+    assert not at.warning
+    assert at.multiselect(key="multi_food").value == []
+    assert log.day_totals(at.query_params["user"][0])["entries"] == 1
@@ -0,0 +1,178 @@
+"""
+llm_client 테스트: 로컬 가짜 Gemini REST 서버(GEMINI_API_ENDPOINT)로
+동시 실행 제한 / 타임아웃 / 재시도 / 요청 합치기를 확인합니다.
+
+실행:  python -m pytest tests/test_llm_client.py
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+genai = pytest.importorskip("google.generativeai")
+from google.api_core import exceptions
+
+import llm_client
+from llm_client import GEMINI_MODEL, LLMClient, configure_gemini, gemini_client
+
+
+class StubGemini(ThreadingHTTPServer):
+    """
+    generateContent 요청을 받는 가짜 서버.
+    respond(prompt, attempt) → (HTTP 상태, 지연 초)로 요청마다 응답을 정합니다.
+    (attempt는 같은 prompt의 몇 번째 요청인지, 0부터)
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.respond = lambda prompt, attempt: (200, 0.0)
+        self.calls = {}  # prompt → 요청 수
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    @property
+    def endpoint(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["contents"][0]["parts"][0]["text"]
+        with server.lock:
+            attempt = server.calls.get(prompt, 0)
+            server.calls[prompt] = attempt + 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            status, delay = server.respond(prompt, attempt)
+            time.sleep(delay)
+            if status == 200:
+                payload = {"candidates": [{"content": {"role": "model", "parts": [{"text": f"응답:{prompt}"}]},
+                                           "finishReason": "STOP", "index": 0}]}
+            else:
+                payload = {"error": {"code": status, "message": "stub error"}}
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):  # 클라이언트가 타임아웃으로 먼저 끊음
+            pass
+        finally:
+            with server.lock:
+                server.active -= 1
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    server = StubGemini()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("GEMINI_API_ENDPOINT", server.endpoint)
+    configure_gemini("test-key")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(**kwargs):
+    kwargs.setdefault("backoff", 0.01)
+    return gemini_client(genai.GenerativeModel(GEMINI_MODEL), **kwargs)
+
+
+def test_generate_round_trip(stub):
+    assert make_client().generate("안녕") == "응답:안녕"
+    assert stub.calls == {"안녕": 1}
+
+
+def test_concurrency_is_bounded(stub):
+    stub.respond = lambda prompt, attempt: (200, 0.2)
+    client = make_client(max_concurrency=2)
+    futures = [client.submit(f"질문 {i}") for i in range(6)]
+    assert [f.result(timeout=10) for f in futures] == [f"응답:질문 {i}" for i in range(6)]
+    assert stub.max_active == 2
+
+
+def test_timeout_raises_without_waiting_for_upstream(stub):
+    stub.respond = lambda prompt, attempt: (200, 2.0)
+    client = make_client(timeout=0.3, max_retries=0)
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        client.generate("느린 질문")
+    assert time.perf_counter() - start < 1.5
+    assert stub.calls == {"느린 질문": 1}
+
+
+def test_timed_out_call_keeps_its_slot_until_thread_finishes():
+    release = threading.Event()
+    started = []
+
+    def generate(contents):
+        started.append(contents)
+        if contents == "멈춤":
+            release.wait(5)
+        return contents
+
+    client = LLMClient(generate, max_concurrency=1, timeout=0.1, max_retries=0)
+    with pytest.raises(TimeoutError):
+        client.generate("멈춤")
+    waiting = client.submit("다음")
+    time.sleep(0.3)
+    assert started == ["멈춤"]  # 앞 호출 스레드가 끝나기 전에는 새 호출이 시작되지 않음
+    release.set()
+    assert waiting.result(timeout=5) == "다음"
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_retries_transient_errors(stub, status):
+    stub.respond = lambda prompt, attempt: (status if attempt < 2 else 200, 0.0)
+    assert make_client(max_retries=2).generate("재시도") == "응답:재시도"
+    assert stub.calls == {"재시도": 3}
+
+
+def test_gives_up_after_max_retries(stub):
+    stub.respond = lambda prompt, attempt: (503, 0.0)
+    with pytest.raises(exceptions.ServiceUnavailable):
+        make_client(max_retries=2).generate("계속 실패")
+    assert stub.calls == {"계속 실패": 3}
+
+
+@pytest.mark.parametrize("status, error", [(400, exceptions.BadRequest), (403, exceptions.Forbidden)])
+def test_does_not_retry_client_errors(stub, status, error):
+    stub.respond = lambda prompt, attempt: (status, 0.0)
+    with pytest.raises(error):
+        make_client(max_retries=2).generate("잘못된 요청")
+    assert stub.calls == {"잘못된 요청": 1}
+
+
+def test_concurrent_identical_requests_are_coalesced(stub):
+    stub.respond = lambda prompt, attempt: (200, 0.3)
+    client = make_client(max_concurrency=4)
+    futures = [client.submit("같은 질문") for _ in range(5)]
+    assert {f.result(timeout=10) for f in futures} == {"응답:같은 질문"}
+    assert stub.calls == {"같은 질문": 1}
+
+
+def test_is_retryable():
+    assert llm_client.is_retryable(TimeoutError())
+    assert llm_client.is_retryable(exceptions.TooManyRequests("429"))
+    assert llm_client.is_retryable(exceptions.ResourceExhausted("429"))
+    assert llm_client.is_retryable(exceptions.InternalServerError("500"))
+    assert llm_client.is_retryable(exceptions.DeadlineExceeded("504"))
+    assert not llm_client.is_retryable(exceptions.InvalidArgument("400"))
+    assert not llm_client.is_retryable(ValueError())
@@ -0,0 +1,85 @@
+import time
+
+import numpy as np
+from sklearn.model_selection import KFold, cross_validate
+
+import model_registry
+from food_table import FOOD_CSV_PATH, file_digest, read_food_csv
+
+# ============================================================
+# 칼로리 보정 모델 오프라인 학습 파이프라인
+# ============================================================
+# food1.csv 전체(약 14.6k행)로 탄수화물/단백질/지방/당류/나트륨 → 에너지(kcal)
+# 회귀 모델을 학습합니다.
+#   1. 피처 행렬을 한 번에 NumPy 배열로 준비
+#   2. 5-fold 교차 검증 (R², MAE, 폴드별 학습 시간)
+#   3. 전체 데이터로 최종 학습 후 추론 지연 시간 측정 (1건 / 1,000건)
+#   4. 모델 + 매니페스트(버전, 해시, 지표) 저장 → 앱은 model_registry로 불러옴
+#
+# 실행:  python train_calorie_model.py
+
+N_SPLITS = 5
+LATENCY_REPEAT = 200
+
+
+def cross_validation_report(X, y):
+    """K-fold 교차 검증 결과 요약 (dict)."""
+    cv = KFold(n_splits=N_SPLITS, shuffle=True, random_state=42)
+    scores = cross_validate(
+        model_registry.make_model(), X, y, cv=cv,
+        scoring=("r2", "neg_mean_absolute_error"),
+    )
+    return {
+        "cv_folds": N_SPLITS,
+        "cv_r2_mean": float(scores["test_r2"].mean()),
+        "cv_r2_std": float(scores["test_r2"].std()),
+        "cv_mae_mean": float(-scores["test_neg_mean_absolute_error"].mean()),
+        "cv_fit_seconds_mean": float(scores["fit_time"].mean()),
+    }
+
+
+def inference_latency(model, X):
+    """1건 예측과 1,000건 일괄 예측의 평균 소요 시간 (ms)."""
+    single = X[:1]
+    batch = X[:1000]
+    t = time.perf_counter()
+    for _ in range(LATENCY_REPEAT):
+        model.predict(single)
+    single_ms = (time.perf_counter() - t) / LATENCY_REPEAT * 1000
+    t = time.perf_counter()
+    for _ in range(LATENCY_REPEAT // 10):
+        model.predict(batch)
+    batch_ms = (time.perf_counter() - t) / (LATENCY_REPEAT // 10) * 1000
+    return {"predict_1_ms": single_ms, "predict_1000_ms": batch_ms}
+
+
+def main():
+    df = read_food_csv(FOOD_CSV_PATH)
+    X = model_registry.feature_matrix(df)
+    y = df[model_registry.TARGET].to_numpy(dtype=np.float64)
+    print(f"📦 학습 데이터: {len(df):,}행, 피처 {model_registry.FEATURES}")
+
+    report = cross_validation_report(X, y)
+    print(f"📊 {N_SPLITS}-fold CV: R² {report['cv_r2_mean']:.4f} ± {report['cv_r2_std']:.4f}, "
+          f"MAE {report['cv_mae_mean']:.2f} kcal, 폴드 평균 학습 {report['cv_fit_seconds_mean']:.2f}s")
+
+    t = time.perf_counter()
+    model, extra = model_registry.train_model(df)
+    fit_seconds = time.perf_counter() - t
+    print(f"🏋️ 전체 데이터 학습: {fit_seconds:.2f}s")
+
+    latency = inference_latency(model, X)
+    print(f"⚡ 추론: 1건 {latency['predict_1_ms']:.3f} ms, 1,000건 {latency['predict_1000_ms']:.3f} ms")
+
+    manifest = model_registry.save_model(model, {
+        **extra,
+        **report,
+        **latency,
+        "fit_seconds": fit_seconds,
+        "data_sha256": file_digest(FOOD_CSV_PATH),
+    })
+    print(f"✅ 저장 완료: {model_registry.MODEL_PATH} (버전 {manifest['version']})")
+
+
+if __name__ == "__main__":
+    main()